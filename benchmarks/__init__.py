@@ -0,0 +1 @@
+"""Benchmarks del pipeline del dashboard con datos sintéticos (sin conexión a Google)."""
@@ -0,0 +1,203 @@
+"""Benchmarks del pipeline del dashboard.
+
+Mide, para cada tamaño de hoja, las etapas que se ejecutan al servir el
+dashboard y escribe los tiempos en un JSON para comparar entre versiones.
+
+Uso:
+    python -m benchmarks.ejecutar --filas 10000 100000 1000000
+    python -m benchmarks.ejecutar --filas 100000 --comparar bench_base.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from statistics import median
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generador import ENCABEZADOS, generar_filas
+from benchmarks.hoja_falsa import HojaFalsa
+from pesca import graficos
+from pesca.acumulados import comparar_periodos, periodo_anterior
+from pesca.actualizacion import ActualizadorDatos, DatosProcesados
+from pesca.agregaciones import ReporteDiario
+from pesca.exportacion import exportar
+from pesca.ingesta import COLUMNAS_USADAS, procesar_registros
+from pesca.rendimiento import AlmacenDescargas, calcular_rendimiento, envasado_por_lote
+from pesca.ritmo import calcular_ritmo
+from pesca.sincronizacion import SincronizadorHoja
+from pesca.snapshot import cargar_snapshot, guardar_snapshot
+
+KILOS_POR_BANDEJA = 10.0
+
+
+def _medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def _benchmarks(filas_crudas, repeticiones):
+    """Genera (nombre, tiempos) para cada etapa sobre una hoja de `len(filas_crudas)` filas."""
+    # Las hojas convierten sus celdas (sin formato) una sola vez, fuera de las mediciones
+    hoja = HojaFalsa(ENCABEZADOS, filas_crudas)
+    crudo = SincronizadorHoja(hoja, COLUMNAS_USADAS).sincronizar().filas
+    yield "lectura_hoja", _medir(lambda: SincronizadorHoja(hoja, COLUMNAS_USADAS).sincronizar(), repeticiones)
+
+    yield "parseo_tipado", _medir(lambda: procesar_registros(crudo), repeticiones)
+
+    datos = procesar_registros(crudo)
+    yield "orden_indice_rollup", _medir(lambda: DatosProcesados.desde_registros(datos), repeticiones)
+    procesados = DatosProcesados.desde_registros(datos)
+    indice, rollup = procesados.indice, procesados.rollup
+
+    sincronizado = SincronizadorHoja(hoja, COLUMNAS_USADAS)
+    sincronizado.sincronizar()
+    hoja_ampliada = HojaFalsa(ENCABEZADOS, filas_crudas + generar_filas(500, semilla=1))
+    SincronizadorHoja(hoja_ampliada, COLUMNAS_USADAS).sincronizar()
+
+    def incremental():
+        actualizador = ActualizadorDatos(SincronizadorHoja(hoja_ampliada, COLUMNAS_USADAS), procesar_registros)
+        actualizador.procesados = procesados
+        actualizador.sincronizador.restaurar(sincronizado.estado())
+        actualizador.actualizar()
+    yield "sincronizacion_incremental_500", _medir(incremental, repeticiones)
+
+    dias = pd.Series(indice.datos['Fecha_Filtro'].dropna().unique()).dt.date.tolist()
+    ultimo_dia = dias[-1]
+    yield "filtrado_diario", _medir(lambda: [indice.dia(d) for d in dias[-30:]], repeticiones)
+
+    dia = indice.dia(ultimo_dia)
+
+    def reporte():
+        r = ReporteDiario.desde_registros(dia)
+        r.pivote_toneladas('Cuadrilla', KILOS_POR_BANDEJA)
+        r.pivote_toneladas('Lote', KILOS_POR_BANDEJA)
+        r.resumen_por('Lote', KILOS_POR_BANDEJA)
+        r.resumen_por('Cuadrilla', KILOS_POR_BANDEJA)
+        for lote in r.lotes:
+            r.detalle_lote(lote, KILOS_POR_BANDEJA)
+    yield "agregacion_reporte", _medir(reporte, repeticiones)
+    yield "ritmo_cuadrillas", _medir(lambda: calcular_ritmo(dia), repeticiones)
+
+    pivote = ReporteDiario.desde_registros(dia).pivote_toneladas('Cuadrilla', KILOS_POR_BANDEJA)
+
+    def echarts_en_frio():
+        graficos._opciones.clear()
+        graficos.opciones_barras_apiladas(pivote, "Cuadrilla", 90)
+    yield "opciones_echarts_frio", _medir(echarts_en_frio, repeticiones)
+    yield "opciones_echarts_memo", _medir(lambda: graficos.opciones_barras_apiladas(pivote, "Cuadrilla", 90), repeticiones)
+
+    def historico():
+        tabla = rollup.rango(dias[max(0, len(dias) - 90)], ultimo_dia, rollup.cuadrillas()[:10])
+        tabla.groupby('Fecha_Filtro')['Bandejas'].sum()
+    yield "historico_90_dias", _medir(historico, repeticiones)
+    yield "mapa_horario_temporada", _medir(lambda: graficos.mapa_horario(indice.datos), repeticiones)
+
+    # Arrastrar el rango en el Histórico: cada rango se compara con el anterior
+    azar = np.random.default_rng(0)
+    rangos = [tuple(sorted(azar.choice(dias, 2))) for _ in range(100)]
+
+    def comparacion_rangos():
+        for desde, hasta in rangos:
+            comparar_periodos(
+                rollup.acumulados, (desde, hasta), periodo_anterior(desde, hasta, "Período anterior"),
+                KILOS_POR_BANDEJA, rollup.cuadrillas()[:10]
+            )
+    yield "comparacion_100_rangos", _medir(comparacion_rangos, repeticiones)
+
+    semana = indice.rango(dias[max(0, len(dias) - 7)], ultimo_dia)
+    yield "exportacion_xlsx_7_dias", _medir(lambda: exportar(semana, "xlsx"), repeticiones)
+    yield "exportacion_csv_completo", _medir(lambda: exportar(indice.datos, "csv"), repeticiones)
+    yield "exportacion_parquet_completo", _medir(lambda: exportar(indice.datos, "parquet"), repeticiones)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "snapshot.parquet")
+        estado = {"encabezados": ENCABEZADOS, "filas_ingeridas": len(filas_crudas), "ultima_fila": None}
+        yield "snapshot_escritura", _medir(lambda: guardar_snapshot(ruta, indice.datos, estado), repeticiones)
+        yield "snapshot_lectura", _medir(lambda: cargar_snapshot(ruta), repeticiones)
+
+        # Temporada completa con una descarga registrada por cada (día, Lote)
+        almacen = AlmacenDescargas(os.path.join(carpeta, "descargas.db"))
+        envasado = envasado_por_lote(rollup.tabla)
+        for dia, lotes in envasado.groupby('Fecha_Filtro'):
+            almacen.guardar(dia, dict(zip(lotes['Lote'], lotes['Bandejas'] * KILOS_POR_BANDEJA / 800)))
+
+        def rendimiento_temporada():
+            calcular_rendimiento(envasado_por_lote(rollup.tabla), almacen.leer(), KILOS_POR_BANDEJA)
+        yield "rendimiento_temporada", _medir(rendimiento_temporada, repeticiones)
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar(tamanos, repeticiones):
+    resultados = []
+    for n in tamanos:
+        print(f"== {n:,} filas ==", file=sys.stderr)
+        filas_crudas = generar_filas(n)
+        for nombre, tiempos in _benchmarks(filas_crudas, repeticiones):
+            resultados.append({
+                "benchmark": nombre,
+                "filas": n,
+                "mediana_s": median(tiempos),
+                "min_s": min(tiempos),
+                "repeticiones": len(tiempos),
+            })
+            print(f"  {nombre:<32} {median(tiempos) * 1000:>10.1f} ms", file=sys.stderr)
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(),
+        "commit": _commit_actual(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "resultados": resultados,
+    }
+
+
+def comparar(actual, base):
+    """Imprime la razón actual/base de las medianas (>1 es más lento)."""
+    previos = {(r["benchmark"], r["filas"]): r["mediana_s"] for r in base["resultados"]}
+    print(f"Comparación con {base.get('commit') or base.get('fecha')}:")
+    for r in actual["resultados"]:
+        previo = previos.get((r["benchmark"], r["filas"]))
+        if previo:
+            print(f"  {r['benchmark']:<32} {r['filas']:>9,} filas  x{r['mediana_s'] / previo:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.ejecutar", description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--salida", default="bench_resultados.json")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args(argv)
+
+    resultado = ejecutar(args.filas, args.repeticiones)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2)
+    print(f"Resultados escritos en {args.salida}", file=sys.stderr)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(resultado, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
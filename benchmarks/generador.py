@@ -0,0 +1,47 @@
+"""Generador de filas sintéticas de "Respuestas de formulario 2".
+
+Produce filas de texto tal como se ven en la hoja (valores formateados), con
+una distribución parecida a la de planta: turnos de día, ~20 cuadrillas, un
+par de lotes por día y una columna de texto libre que el dashboard no usa.
+"""
+import numpy as np
+import pandas as pd
+
+ENCABEZADOS = [
+    "Marca temporal", "Cuadrilla", "Producto", "Calidad", "Calibre",
+    "N° de Coche", "Lote", "Bandejas", "Observaciones",
+]
+
+CUADRILLAS = [f"Cuadrilla {i:02d}" for i in range(1, 21)]
+PRODUCTOS = ["Pota", "Perico", "Bonito", "Caballa", "Jurel"]
+CALIDADES = ["A", "B", "C"]
+CALIBRES = ["S", "M", "L", "XL"]
+OBSERVACIONES = ["", "", "", "Sin novedad", "Revisar temperatura", "Coche incompleto"]
+
+
+def generar_filas(n, fin=None, registros_por_dia=1_500, semilla=0):
+    """`n` filas ordenadas por Marca temporal que terminan en el día `fin` (hoy por defecto)."""
+    rng = np.random.default_rng(semilla)
+    fin = pd.Timestamp(fin or pd.Timestamp.today()).normalize()
+    dias = max(1, -(-n // registros_por_dia))
+
+    dia = np.sort(rng.integers(0, dias, n))
+    # Turno de 06:00 a 18:00 con más actividad a media mañana
+    segundos = np.clip(rng.normal(11 * 3600, 2.5 * 3600, n), 6 * 3600, 18 * 3600).astype(np.int64)
+    marca = (fin - pd.Timedelta(days=dias - 1)) + pd.to_timedelta(dia, unit="D") + pd.to_timedelta(segundos, unit="s")
+    orden = np.argsort(marca.values, kind="stable")
+    marca, dia = marca[orden], dia[orden]
+
+    lote = 1000 + dia * 2 + rng.integers(0, 2, n)
+    columnas = {
+        "Marca temporal": marca.strftime("%d/%m/%Y %H:%M:%S"),
+        "Cuadrilla": np.array(CUADRILLAS)[rng.integers(0, len(CUADRILLAS), n)],
+        "Producto": np.array(PRODUCTOS)[rng.choice(len(PRODUCTOS), n, p=[0.4, 0.25, 0.15, 0.1, 0.1])],
+        "Calidad": np.array(CALIDADES)[rng.choice(len(CALIDADES), n, p=[0.6, 0.3, 0.1])],
+        "Calibre": np.array(CALIBRES)[rng.integers(0, len(CALIBRES), n)],
+        "N° de Coche": rng.integers(1, 61, n).astype(str),
+        "Lote": lote.astype(str),
+        "Bandejas": rng.integers(1, 51, n).astype(str),
+        "Observaciones": np.array(OBSERVACIONES)[rng.integers(0, len(OBSERVACIONES), n)],
+    }
+    return pd.DataFrame(columnas, columns=ENCABEZADOS).values.tolist()
@@ -0,0 +1,76 @@
+"""Sustituto local de `gspread.Worksheet` para correr el pipeline sin red.
+
+Implementa sólo lo que usa `SincronizadorHoja`: `batch_get` con rangos A1 de la
+forma "1:1" o "A5:I", por filas o por columnas, con o sin formato. Como la API,
+omite las celdas vacías al final y, sin formato, devuelve los números como
+números y las fechas como seriales de Sheets.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+from gspread.utils import a1_to_rowcol
+
+from pesca.ingesta import EPOCA_SHEETS, FORMATO_MARCA_TEMPORAL
+
+_RANGO = re.compile(r"^([A-Z]*)(\d*):([A-Z]*)(\d*)$")
+
+
+def _sin_formato(textos):
+    """Valores de una columna de texto como los devolvería UNFORMATTED_VALUE + SERIAL_NUMBER."""
+    serie = pd.Series(textos, dtype=object)
+    valores = serie.to_numpy(dtype=object).copy()
+    numeros = pd.to_numeric(serie, errors="coerce")
+    es_numero = numeros.notna().to_numpy()
+    valores[es_numero] = [int(x) if float(x).is_integer() else float(x) for x in numeros[es_numero]]
+    fechas = pd.to_datetime(serie, format=FORMATO_MARCA_TEMPORAL, errors="coerce")
+    es_fecha = fechas.notna().to_numpy()
+    serial = (fechas[es_fecha].to_numpy(dtype="datetime64[s]") - EPOCA_SHEETS) / np.timedelta64(1, "D")
+    valores[es_fecha] = serial.tolist()
+    return valores.tolist()
+
+
+def _recortar(lineas):
+    lineas = [list(l) for l in lineas]
+    for linea in lineas:
+        while linea and linea[-1] == "":
+            linea.pop()
+    while lineas and not lineas[-1]:
+        lineas.pop()
+    return lineas
+
+
+class HojaFalsa:
+    def __init__(self, encabezados, filas):
+        self.encabezados = list(encabezados)
+        self.filas = [list(f) for f in filas]
+        self.llamadas = []
+        self._columnas = {}
+
+    def agregar(self, filas):
+        self.filas.extend(list(f) for f in filas)
+        self._columnas.clear()
+
+    def _columna(self, indice, sin_formato):
+        clave = (indice, sin_formato)
+        if clave not in self._columnas:
+            textos = [f[indice] if indice < len(f) else "" for f in self.filas]
+            encabezado = self.encabezados[indice] if indice < len(self.encabezados) else ""
+            self._columnas[clave] = [encabezado] + (_sin_formato(textos) if sin_formato else textos)
+        return self._columnas[clave]
+
+    def batch_get(self, rangos, major_dimension=None, value_render_option=None, date_time_render_option=None):
+        self.llamadas.append("batch_get")
+        sin_formato = value_render_option == "UNFORMATTED_VALUE"
+        por_columnas = major_dimension == "COLUMNS"
+        return [self._rango(r, sin_formato, por_columnas) for r in rangos]
+
+    def _rango(self, rango, sin_formato, por_columnas):
+        col_ini, fila_ini, col_fin, fila_fin = _RANGO.match(rango).groups()
+        ancho = max([len(self.encabezados)] + [len(f) for f in self.filas[-1:]])
+        c0 = a1_to_rowcol(f"{col_ini}1")[1] - 1 if col_ini else 0
+        c1 = min(a1_to_rowcol(f"{col_fin}1")[1], ancho) if col_fin else ancho
+        f0 = int(fila_ini) - 1 if fila_ini else 0
+        f1 = int(fila_fin) if fila_fin else None
+        columnas = [self._columna(c, sin_formato)[f0:f1] for c in range(c0, c1)]
+        return _recortar(columnas if por_columnas else zip(*columnas))
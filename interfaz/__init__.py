@@ -0,0 +1,8 @@
+"""Interfaz de Streamlit del dashboard: carga de datos, cachés compartidas, gráficos y pestañas.
+
+La lógica de datos vive en `pesca` (sin Streamlit); aquí sólo se decide qué se
+muestra y qué se comparte entre sesiones. Las librerías pesadas (Plotly,
+ECharts, gspread, xlsxwriter, pyarrow.parquet) se importan dentro de las
+funciones que las usan, para que la página pinte antes de cargarlas. El núcleo
+de pyarrow lo carga pandas al importarse.
+"""
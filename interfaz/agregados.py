@@ -0,0 +1,43 @@
+"""Agregados compartidos entre sesiones, uno por consulta y versión de datos.
+
+Lo que devuelven estas funciones lo comparten todas las sesiones: sólo lectura.
+"""
+import streamlit as st
+
+from pesca.agregaciones import ReporteDiario
+from pesca.graficos import mapa_horario
+from pesca.rendimiento import envasado_por_lote
+from pesca.ritmo import calcular_ritmo
+
+
+# --- AGREGADOS DEL DÍA (compartidos, uno por fecha y versión de datos) ---
+@st.cache_resource(max_entries=64)
+def obtener_reporte_diario(_registros_dia, version, fecha):
+    return ReporteDiario.desde_registros(_registros_dia)
+
+# --- RITMO DE LAS CUADRILLAS (compartido, uno por fecha y versión de datos) ---
+@st.cache_resource(max_entries=32)
+def obtener_ritmo(_registros_dia, version, fecha):
+    return calcular_ritmo(_registros_dia)
+
+# --- RESUMEN DEL HISTÓRICO (compartido, uno por rango, cuadrillas y versión de datos) ---
+@st.cache_resource(max_entries=32)
+def obtener_rollup(_vista, version, desde, hasta, cuadrillas):
+    return _vista.rollup(desde, hasta, list(cuadrillas))
+
+# --- ENVASADO POR DÍA Y LOTE (para el rendimiento de un rango) ---
+@st.cache_resource(max_entries=16)
+def obtener_envasado(_vista, version, desde, hasta):
+    return envasado_por_lote(_vista.rollup(desde, hasta))
+
+# --- MAPA POR HORA (compartido, uno por rango, cuadrillas y versión de datos) ---
+@st.cache_resource(max_entries=32)
+def obtener_mapa_horario(_vista, version, desde, hasta, cuadrillas=None):
+    # Sólo las tres columnas que usa: con SQLite y Parquet no se lee el resto
+    registros = _vista.registros(desde, hasta, None if cuadrillas is None else list(cuadrillas), ['Marca temporal', 'Cuadrilla', 'Bandejas'])
+    return mapa_horario(registros)
+
+# --- HISTORIAL PAGINADO (uno por filtro y versión de datos; el orden no genera otra copia) ---
+@st.cache_resource(max_entries=4)
+def obtener_consulta_historial(_vista, version, filtro):
+    return _vista.consultar_historial(filtro)
@@ -0,0 +1,69 @@
+"""Conexión con Google Sheets y origen de datos compartido por todas las sesiones."""
+import os
+
+import streamlit as st
+
+from interfaz.config import FUENTE_DATOS, HOJA_SHEETS, INTERVALO_REFRESCO, LIBRO_SHEETS, RUTA_DESCARGAS, RUTA_SNAPSHOT
+from pesca.actualizacion import ActualizadorDatos
+from pesca.cache import CacheDatos
+from pesca.fuentes import FuenteParquet, FuenteSheets, FuenteSQLite
+from pesca.ingesta import COLUMNAS_USADAS, procesar_registros
+from pesca.rendimiento import AlmacenDescargas
+
+
+# --- CONEXIÓN HÍBRIDA ---
+@st.cache_resource
+def conectar_google_sheets():
+    # gspread y google-auth sólo se cargan si el origen es Sheets
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+
+    if os.path.exists("credenciales.json"):
+        credentials = Credentials.from_service_account_file("credenciales.json", scopes=scopes)
+    elif "gcp_service_account" in st.secrets:
+        creds_dict = dict(st.secrets["gcp_service_account"])
+        credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
+    else:
+        st.error("❌ No se encontraron credenciales.")
+        st.stop()
+        
+    client = gspread.authorize(credentials)
+    return client
+
+# --- CARGA DE DATOS ---
+@st.cache_resource
+def obtener_sincronizador():
+    from pesca.sincronizacion import SincronizadorHoja
+
+    client = conectar_google_sheets()
+    sheet = client.open(LIBRO_SHEETS).worksheet(HOJA_SHEETS)
+    return SincronizadorHoja(sheet, COLUMNAS_USADAS)
+
+# --- ORIGEN DE DATOS ---
+@st.cache_resource
+def obtener_fuente():
+    tipo, _, ruta = FUENTE_DATOS.partition(":")
+    if tipo == "sqlite":
+        return FuenteSQLite(ruta or "historial.db")
+    if tipo == "parquet":
+        return FuenteParquet(ruta or RUTA_SNAPSHOT)
+    return FuenteSheets(obtener_cache_datos())
+
+# --- CACHÉ COMPARTIDA ENTRE SESIONES ---
+@st.cache_resource
+def obtener_cache_datos():
+    actualizador = ActualizadorDatos(obtener_sincronizador(), procesar_registros, RUTA_SNAPSHOT)
+    cache = CacheDatos(actualizador.actualizar, intervalo=INTERVALO_REFRESCO)
+    # Arranque en frío: se sirve el snapshot local y la cola de Sheets llega en segundo plano
+    datos_locales = actualizador.cargar_local()
+    if datos_locales is not None:
+        cache.publicar(datos_locales)
+    cache.iniciar(inmediato=datos_locales is not None)
+    return cache
+
+# --- DESCARGAS REGISTRADAS (Rendimiento) ---
+@st.cache_resource
+def obtener_almacen_descargas():
+    return AlmacenDescargas(RUTA_DESCARGAS)
@@ -0,0 +1,66 @@
+"""Piezas de interfaz compartidas por las pestañas y la página principal."""
+import functools
+import uuid
+
+import streamlit as st
+
+from interfaz.carga import obtener_fuente
+from interfaz.config import INTERVALO_REFRESCO
+from pesca import diagnostico
+
+
+# --- FRAGMENTOS ---
+def fragmento(func):
+    # st.fragment que muestra los errores igual que el bloque principal,
+    # también cuando el fragmento se vuelve a ejecutar por sí solo
+    @functools.wraps(func)
+    def envoltura(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            st.error(f"❌ Error: {e}")
+    return st.fragment(envoltura)
+
+# --- REFRESCO AUTOMÁTICO ---
+@st.fragment(run_every=INTERVALO_REFRESCO)
+def vigilar_version(version):
+    # Comprobación barata (sin tocar Sheets): la página sólo se vuelve a ejecutar si hay datos nuevos
+    if obtener_fuente().obtener().version != version:
+        st.rerun()
+
+# --- SESIONES ---
+def registrar_sesion():
+    # Sólo se anota el tamaño del estado propio de la sesión (los datos son compartidos)
+    id_sesion = st.session_state.setdefault("id_sesion", uuid.uuid4().hex)
+    diagnostico.registrar_sesion(id_sesion, st.session_state.to_dict())
+
+# --- PANEL DE DIAGNÓSTICO ---
+def panel_diagnostico(mediciones, vista):
+    with st.sidebar.expander("🩺 Diagnóstico", expanded=True):
+        st.caption("Esta ejecución")
+        st.dataframe(
+            diagnostico.tabla_ejecucion(mediciones), hide_index=True, use_container_width=True,
+            column_config={"ms": st.column_config.NumberColumn(format="%.1f"), "Δ memoria (MB)": st.column_config.NumberColumn(format="%+.1f")}
+        )
+        st.caption(f"Últimas {diagnostico.VENTANA} mediciones por etapa (todas las sesiones)")
+        st.dataframe(
+            diagnostico.percentiles(), hide_index=True, use_container_width=True,
+            column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ["p50 (ms)", "p95 (ms)", "Máx (ms)"]}
+        )
+        memoria = diagnostico.memoria_residente()
+        if memoria is not None:
+            st.caption(f"Memoria residente del proceso: {memoria / 2**20:,.0f} MB")
+
+        # Memoria: los datos se guardan una vez por proceso; por sesión sólo su estado
+        st.caption("Memoria por objeto")
+        estado = st.session_state.to_dict()
+        st.dataframe(
+            diagnostico.informe_memoria(vista.en_memoria(), {f"Estado ({len(estado)} claves)": estado}), hide_index=True, use_container_width=True,
+            column_config={"MB": st.column_config.NumberColumn(format="%.3f")}
+        )
+        estados = diagnostico.sesiones_activas()
+        if estados:
+            st.caption(
+                f"Sesiones activas (últimos {diagnostico.VENTANA_SESIONES // 60} min): {len(estados)} · "
+                f"estado por sesión: {sum(estados) / len(estados) / 2**10:,.1f} KB de media, {max(estados) / 2**10:,.1f} KB máx."
+            )
@@ -0,0 +1,15 @@
+"""Configuración por variables de entorno."""
+import os
+
+# Segundos entre refrescos automáticos de los datos compartidos
+INTERVALO_REFRESCO = int(os.environ.get("PESCA_INTERVALO_REFRESCO", "60"))
+# Copia local de los datos procesados para arrancar sin esperar a Sheets
+RUTA_SNAPSHOT = os.environ.get("PESCA_SNAPSHOT", "datos_pesca.parquet")
+# Origen de los datos: "sheets" (por defecto), "sqlite:historial.db" o "parquet:archivo.parquet"
+FUENTE_DATOS = os.environ.get("PESCA_FUENTE", "sheets")
+LIBRO_SHEETS = os.environ.get("PESCA_LIBRO", "Base de datos")
+HOJA_SHEETS = os.environ.get("PESCA_HOJA", "Respuestas de formulario 2")
+# Toneladas descargadas por día y lote que se ingresan en la pestaña Rendimiento
+RUTA_DESCARGAS = os.environ.get("PESCA_DESCARGAS", "descargas.db")
+# Líneas JSON con el tiempo de cada etapa en el log del servidor
+LOG_ETAPAS = bool(os.environ.get("PESCA_LOG_ETAPAS"))
@@ -0,0 +1,170 @@
+"""Estilos de la página (CSS y encabezado) y de los gráficos de Plotly."""
+import streamlit as st
+
+ESTILOS_CSS = """
+    <style>
+        .main-title {
+            text-align: center !important;
+            color: #004080;
+            font-weight: 800;
+            font-family: 'Arial Black', sans-serif;
+        }
+        
+        /* =========================================
+           1. HEADER SUPERIOR
+           ========================================= */
+        header[data-testid="stHeader"] {
+            background-color: #004080;
+        }
+        
+        header[data-testid="stHeader"] svg,
+        header[data-testid="stHeader"] button {
+            color: white !important;
+            fill: white !important;
+        }
+
+        /* =========================================
+           2. FLECHA DE BARRA LATERAL CONTRAÍDA
+           ========================================= */
+        .st-emotion-cache-pd6qx2 {
+            color: white !important;
+            fill: white !important;
+            opacity: 1 !important;
+        }
+        
+        [data-testid="stSidebarCollapsedControl"] {
+            color: white !important;
+            background-color: #004080 !important;
+            opacity: 1 !important;
+        }
+        
+        [data-testid="stSidebarCollapsedControl"] svg {
+            fill: white !important;
+        }
+
+        /* =========================================
+           3. BARRA LATERAL (SIDEBAR) - ESTILOS GENERALES
+           ========================================= */
+        section[data-testid="stSidebar"] {
+            background-color: #004080;
+        }
+        
+        section[data-testid="stSidebar"] h1, 
+        section[data-testid="stSidebar"] h2, 
+        section[data-testid="stSidebar"] h3, 
+        section[data-testid="stSidebar"] label, 
+        section[data-testid="stSidebar"] span,
+        section[data-testid="stSidebar"] div[data-testid="stMarkdownContainer"] p {
+            color: white !important;
+        }
+
+        section[data-testid="stSidebar"] input,
+        section[data-testid="stSidebar"] .stSelectbox div,
+        section[data-testid="stSidebar"] .stMultiSelect div {
+            color: #31333F !important;
+        }
+        
+        section[data-testid="stSidebar"] div[data-baseweb="select"] > div,
+        section[data-testid="stSidebar"] div[data-baseweb="base-input"] {
+            background-color: white !important;
+            color: #31333F !important;
+        }
+
+        /* =========================================
+           4. TAGS DE MULTISELECT
+           ========================================= */
+        .st-c2,
+        span[data-baseweb="tag"] {
+            background-color: #004080 !important; /* Fondo azul para contraste */
+            color: white !important;
+        }
+
+        /* =========================================
+           5. PESTAÑAS (TABS)
+           ========================================= */
+        .stTabs [data-baseweb="tab-list"] {
+            gap: 10px;
+            border-bottom: 1px solid #d0d7de;
+            background-color: transparent !important;
+            padding-top: 10px;
+            padding-left: 10px;
+            border-radius: 5px 5px 0 0;
+        }
+        
+        .stTabs [data-baseweb="tab"] {
+            height: 55px;
+            white-space: pre-wrap;
+            background-color: #f8f9fa;
+            border-radius: 8px 8px 0px 0px;
+            border: 1px solid #e1e4e8;
+            border-bottom: none;
+            padding: 10px 25px; 
+            font-size: 16px;
+            font-weight: 600;
+            color: #555;
+        }
+        
+        .stTabs [data-baseweb="tab"]:hover {
+            background-color: #eef2f6;
+            color: #004080;
+        }
+
+        .stTabs [aria-selected="true"] {
+            background-color: #004080 !important;
+            color: white !important;
+            border-color: #004080;
+        }
+
+        /* =========================================
+           6. AJUSTES MÓVILES
+           ========================================= */
+        @media (max-width: 640px) {
+            .stTabs [data-baseweb="tab"] {
+                font-size: 12px !important;
+                padding: 5px 10px !important;
+                height: auto !important;
+            }
+        }
+    </style>
+    <h1 class='main-title'>&#128031; Dashboard de Producción Pesquera</h1>
+    <hr style='border: 2px solid #004080; border-radius: 5px;'>
+"""
+
+
+def aplicar_estilos():
+    """CSS y título. Se llama antes de cargar datos para que la página pinte de inmediato."""
+    st.markdown(ESTILOS_CSS, unsafe_allow_html=True)
+
+
+def estilo_grafico(fig):
+    fig.update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(color='black', size=12, family="Arial"),
+        margin=dict(l=40, r=40, t=50, b=50),
+        xaxis=dict(
+            showline=True, linewidth=1, linecolor='black', mirror=True,
+            title_font=dict(size=14, color='black', family="Arial Black"),
+            tickfont=dict(color='black', size=12, family="Arial", weight="bold")
+        ),
+        yaxis=dict(
+            showline=True, linewidth=1, linecolor='black', mirror=True,
+            title_font=dict(size=14, color='black', family="Arial Black"),
+            tickfont=dict(color='black', size=12, family="Arial", weight="bold"),
+            gridcolor='#eeeeee'
+        ),
+        # LEYENDA OPTIMIZADA
+        legend=dict(
+            orientation="h",        # Horizontal
+            yanchor="top",
+            y=-0.2,                 # Posición debajo del eje X
+            xanchor="left",         # Alineado a la izquierda
+            x=0,                    # Empieza desde el borde izquierdo
+            title=None,             # Sin título
+            font=dict(size=12, color='black', family="Arial"),
+            bgcolor="rgba(255,255,255, 0.9)",
+            bordercolor="rgba(0,0,0,0)", 
+            borderwidth=0
+        )
+    )
+    return fig
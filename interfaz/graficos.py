@@ -0,0 +1,153 @@
+"""Gráficos de las pestañas. Plotly y ECharts se importan al dibujar el primer gráfico."""
+import numpy as np
+import streamlit as st
+
+from interfaz.estilos import estilo_grafico
+from pesca.agregaciones import a_kilos
+from pesca.graficos import UMBRAL_WEBGL, densidad_actividad, mapa_horario, opciones_barras_apiladas
+
+
+# --- GRÁFICO DE ACTIVIDAD (compartido, uno por día, modo y versión de datos) ---
+@st.cache_resource(max_entries=32)
+def figura_actividad(_df_filtrado, version, fecha, modo, minutos, kilos_por_bandeja):
+    # La figura es compartida entre sesiones: no modificarla después
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    df_filtrado = _df_filtrado
+    if modo == "Densidad":
+        # Bandejas por Cuadrilla e intervalo: el tamaño no depende del número de registros
+        densidad = densidad_actividad(df_filtrado, minutos)
+        fig_timeline = go.Figure(go.Heatmap(
+            z=np.where(densidad.registros > 0, densidad.bandejas, np.nan),
+            x=densidad.inicios,
+            y=densidad.cuadrillas,
+            customdata=densidad.registros,
+            colorscale="Blues",
+            colorbar=dict(title="Bandejas"),
+            hovertemplate="%{y} · %{x|%H:%M}<br>Bandejas: %{z:,.0f}<br>Registros: %{customdata}<extra></extra>"
+        ))
+        fig_timeline.update_layout(height=450)
+    elif modo == "Por hora":
+        mapa = mapa_horario(df_filtrado)
+        fig_timeline = figura_mapa_horario(mapa.por_cuadrilla(), mapa.cuadrillas, "Cuadrilla")
+    else:
+        fig_timeline = px.scatter(
+            df_filtrado, # ya viene ordenado por Marca temporal
+            x="Marca temporal",
+            y="Cuadrilla",
+            color="Producto",
+            hover_data={
+                "Lote": True, "Bandejas": True,
+                "Kilos Calc": a_kilos(df_filtrado['Bandejas'], kilos_por_bandeja),
+                "N° de Coche": True,
+            },
+            color_discrete_sequence=px.colors.qualitative.Bold,
+            # Días con muchos registros: WebGL en lugar de un nodo SVG por punto
+            render_mode="webgl" if len(df_filtrado) > UMBRAL_WEBGL else "svg",
+            height=450
+        )
+        fig_timeline.update_traces(marker=dict(size=12, line=dict(width=1, color='DarkSlateGrey')))
+    fig_timeline.update_xaxes(tickformat="%H:%M", title_text="<b>Hora del Día</b>")
+
+    # REQUISITO: Etiquetas de cuadrillas verticales y ajustadas
+    fig_timeline.update_yaxes(
+        title_text="<b>Cuadrilla</b>", 
+        tickangle=-90,  # Rotación vertical
+        automargin=True # Ajuste automático para que no se corten
+    )
+
+    fig_timeline = estilo_grafico(fig_timeline)
+    fig_timeline.update_layout(
+        legend=dict(orientation="h", yanchor="top", y=-0.25, xanchor="center", x=0.5, title=None),
+        margin=dict(b=100)
+    )
+    return fig_timeline
+
+# --- RITMO DE LAS CUADRILLAS (compartido, uno por día, ventana y versión de datos) ---
+@st.cache_resource(max_entries=32)
+def figura_ritmo(_ritmo, version, fecha, minutos):
+    # La figura es compartida entre sesiones: no modificarla después
+    import plotly.express as px
+
+    curvas = _ritmo.curvas
+    columna = f"Ritmo {minutos} min (b/h)"
+    fig_ritmo = px.line(
+        curvas,
+        x="Marca temporal",
+        y=columna,
+        color="Cuadrilla",
+        line_shape="hv",
+        color_discrete_sequence=px.colors.qualitative.Bold,
+        render_mode="webgl" if len(curvas) > UMBRAL_WEBGL else "svg",
+        height=420
+    )
+    fig_ritmo.update_xaxes(tickformat="%H:%M", title_text="<b>Hora del Día</b>")
+    fig_ritmo.update_yaxes(title_text=f"<b>Bandejas/hora ({minutos} min)</b>")
+    fig_ritmo = estilo_grafico(fig_ritmo)
+    fig_ritmo.update_layout(margin=dict(b=100))
+    return fig_ritmo
+
+# --- MAPA DE CALOR POR HORA ---
+def figura_mapa_horario(valores, filas, nombre_filas):
+    """Heatmap filas × hora del día; sólo las horas entre la primera y la última con producción."""
+    import plotly.graph_objects as go
+
+    horas = np.flatnonzero(np.nansum(valores, axis=0) > 0) if len(filas) else np.array([], dtype=int)
+    desde, hasta = (horas[0], horas[-1] + 1) if horas.size else (0, 24)
+    fig_mapa = go.Figure(go.Heatmap(
+        z=np.where(valores[:, desde:hasta] > 0, valores[:, desde:hasta], np.nan),
+        x=[f"{h:02d}:00" for h in range(desde, hasta)],
+        y=filas,
+        colorscale="Blues",
+        colorbar=dict(title="Bandejas/día"),
+        hovertemplate="%{y} · %{x}<br>Bandejas promedio por día: %{z:,.1f}<extra></extra>"
+    ))
+    fig_mapa.update_layout(height=max(300, 28 * len(filas) + 120))
+    fig_mapa.update_xaxes(title_text="<b>Hora del Día</b>")
+    fig_mapa.update_yaxes(title_text=f"<b>{nombre_filas}</b>", autorange="reversed", automargin=True)
+    return estilo_grafico(fig_mapa)
+
+# --- OPCIONES DE ECHARTS (compartidas, por día, dimensión y versión de datos) ---
+@st.cache_resource(max_entries=64)
+def opciones_toneladas(_reporte, version, fecha, dimension, kilos_por_bandeja, nombre_eje, rotacion_etiquetas):
+    pivote = _reporte.pivote_toneladas(dimension, kilos_por_bandeja)
+    return opciones_barras_apiladas(pivote, nombre_eje, rotacion_etiquetas=rotacion_etiquetas)
+
+def mostrar_echarts(opciones, altura):
+    from streamlit_echarts import st_echarts
+
+    st_echarts(options=opciones, height=altura)
+
+# --- EVOLUCIÓN DEL HISTÓRICO ---
+def figura_evolucion(df_evolucion):
+    import plotly.express as px
+
+    fig_evolucion = px.line(
+        df_evolucion, 
+        x='Fecha_Filtro', 
+        y='Toneladas Calc',
+        markers=True,
+        line_shape='spline',
+        text='Toneladas Calc'
+    )
+    fig_evolucion.update_traces(textposition="top center", texttemplate='%{text:.1f} t')
+    fig_evolucion.update_xaxes(title="Fecha", tickformat="%d/%m")
+    fig_evolucion.update_yaxes(title="Toneladas")
+    return estilo_grafico(fig_evolucion)
+
+# --- TENDENCIA DEL RENDIMIENTO ---
+def figura_rendimiento(por_dia):
+    import plotly.express as px
+
+    fig_rendimiento = px.line(
+        por_dia.dropna(subset=['Rendimiento (%)']),
+        x='Fecha_Filtro',
+        y='Rendimiento (%)',
+        markers=True,
+        text='Rendimiento (%)'
+    )
+    fig_rendimiento.update_traces(textposition="top center", texttemplate='%{text:.1f}%')
+    fig_rendimiento.update_xaxes(title="Fecha", tickformat="%d/%m")
+    fig_rendimiento.update_yaxes(title="Rendimiento (%)")
+    return estilo_grafico(fig_rendimiento)
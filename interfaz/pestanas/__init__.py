@@ -0,0 +1 @@
+"""Pestañas del dashboard. Cada una es un fragmento: sus widgets sólo la vuelven a ejecutar."""
@@ -0,0 +1,124 @@
+"""Pestaña 3: tendencias históricas."""
+from datetime import timedelta
+
+import pandas as pd
+import streamlit as st
+
+from interfaz.agregados import obtener_mapa_horario, obtener_rollup
+from interfaz.comun import fragmento
+from interfaz.graficos import figura_evolucion, figura_mapa_horario
+from pesca.acumulados import PERIODOS_COMPARACION, comparar_periodos, periodo_anterior
+from pesca.agregaciones import a_toneladas
+from pesca.diagnostico import etapa
+from pesca.graficos import DIAS_SEMANA
+
+CONFIG_COMPARACION = {
+    "Actual (t)": st.column_config.NumberColumn("Actual (t)", format="%.2f t"),
+    "Anterior (t)": st.column_config.NumberColumn("Anterior (t)", format="%.2f t"),
+    "Δ (t)": st.column_config.NumberColumn("Δ (t)", format="%+.2f t"),
+    "Δ (%)": st.column_config.NumberColumn("Δ (%)", format="%+.1f%%"),
+}
+
+
+def seccion_comparacion(vista, fecha_inicio, fecha_fin, cuadrillas, kilos_por_bandeja):
+    """Período seleccionado frente al anterior, con las sumas acumuladas (sin releer registros)."""
+    st.subheader("⚖️ Comparación de Períodos")
+    modo = st.radio("Comparar con", PERIODOS_COMPARACION, horizontal=True, key="periodo_comparacion")
+    desde_anterior, hasta_anterior = periodo_anterior(fecha_inicio, fecha_fin, modo)
+    with etapa("comparacion"):
+        comparacion = comparar_periodos(
+            vista.acumulados(), (fecha_inicio, fecha_fin), (desde_anterior, hasta_anterior), kilos_por_bandeja, cuadrillas
+        )
+
+    col_c1, col_c2, col_c3 = st.columns(3)
+    col_c1.metric("Período actual", f"{comparacion.actual:,.2f} t")
+    col_c2.metric("Período anterior", f"{comparacion.anterior:,.2f} t")
+    variacion = comparacion.variacion
+    col_c3.metric(
+        "Variación",
+        f"{comparacion.actual - comparacion.anterior:+,.2f} t",
+        delta=None if pd.isna(variacion) else f"{variacion:+.1f} %"
+    )
+    st.caption(f"Período anterior: {desde_anterior:%d/%m/%Y} – {hasta_anterior:%d/%m/%Y}")
+
+    col_cuadrillas, col_productos = st.columns(2)
+    with col_cuadrillas:
+        st.markdown("##### 👷 Por Cuadrilla")
+        st.dataframe(comparacion.por_cuadrilla, column_config=CONFIG_COMPARACION, hide_index=True, use_container_width=True)
+    with col_productos:
+        st.markdown("##### 🐟 Por Producto")
+        st.dataframe(comparacion.por_producto, column_config=CONFIG_COMPARACION, hide_index=True, use_container_width=True)
+
+
+@fragmento
+def pestana_historico(vista, hoy_peru, kilos_por_bandeja):
+    st.markdown("### 📈 Evolución de la Producción")
+    
+    col_fechas, col_cuadrillas = st.columns(2)
+    
+    with col_fechas:
+        fecha_inicio_def = hoy_peru - timedelta(days=7)
+        rango_fechas = st.date_input(
+            "Selecciona Rango de Fechas:",
+            value=(fecha_inicio_def, hoy_peru),
+            max_value=hoy_peru
+        )
+    
+    with col_cuadrillas:
+        todas_cuadrillas = vista.cuadrillas()
+        cuadrillas_seleccionadas = st.multiselect(
+            "Filtrar por Cuadrillas:",
+            options=todas_cuadrillas,
+            default=todas_cuadrillas
+        )
+    
+    if isinstance(rango_fechas, tuple) and len(rango_fechas) == 2:
+        fecha_inicio, fecha_fin = rango_fechas
+        
+        # Se agrega sobre el resumen diario, no sobre los registros
+        if cuadrillas_seleccionadas:
+            with etapa("historico") as medida:
+                df_hist = obtener_rollup(vista, vista.version, fecha_inicio, fecha_fin, tuple(cuadrillas_seleccionadas))
+                medida.filas = len(df_hist)
+        else:
+            st.warning("⚠️ Debes seleccionar al menos una cuadrilla.")
+            df_hist = pd.DataFrame()
+
+        if not df_hist.empty:
+            total_bandejas = df_hist['Bandejas'].sum()
+            dias_produccion = df_hist['Fecha_Filtro'].nunique()
+            col_h1, col_h2, col_h3, col_h4 = st.columns(4)
+            col_h1.metric("Bandejas", f"{total_bandejas:,.0f} 📦")
+            total_toneladas = a_toneladas(total_bandejas, kilos_por_bandeja)
+            col_h2.metric("Toneladas", f"{total_toneladas:,.2f} t ⚖️")
+            col_h3.metric("Días con producción", f"{dias_produccion} 🗓️")
+            col_h4.metric("Promedio diario", f"{total_toneladas / dias_produccion:,.2f} t 📈")
+
+            st.subheader(f"Producción Total Diaria ({len(cuadrillas_seleccionadas)} cuadrillas seleccionadas)")
+            
+            df_evolucion = df_hist.groupby('Fecha_Filtro')[['Bandejas']].sum().reset_index()
+            df_evolucion['Toneladas Calc'] = a_toneladas(df_evolucion['Bandejas'], kilos_por_bandeja)
+            
+            st.plotly_chart(figura_evolucion(df_evolucion), use_container_width=True)
+
+            # --- COMPARACIÓN CON EL PERÍODO ANTERIOR ---
+            seccion_comparacion(vista, fecha_inicio, fecha_fin, cuadrillas_seleccionadas, kilos_por_bandeja)
+
+            # --- MAPA DE CALOR POR HORA (para planificar turnos) ---
+            st.subheader("🗺️ Producción por Hora")
+            eje_mapa = st.radio("Filas", ["Cuadrilla", "Día de la semana"], horizontal=True, key="filas_mapa_historico")
+            with etapa("mapa_horario") as medida:
+                mapa = obtener_mapa_horario(vista, vista.version, fecha_inicio, fecha_fin, tuple(cuadrillas_seleccionadas))
+                medida.filas = len(mapa.cuadrillas)
+            if eje_mapa == "Cuadrilla":
+                fig_mapa = figura_mapa_horario(mapa.por_cuadrilla(), mapa.cuadrillas, "Cuadrilla")
+            else:
+                fig_mapa = figura_mapa_horario(mapa.por_dia_semana(), DIAS_SEMANA, "Día de la semana")
+            st.plotly_chart(fig_mapa, use_container_width=True)
+            st.caption("Bandejas promedio por día con registros (por día de la semana: promedio de las fechas de ese día).")
+            
+        elif cuadrillas_seleccionadas:
+            st.warning("⚠️ No hay datos en el rango de fechas seleccionado.")
+
+    else:
+        st.info("Selecciona una fecha de inicio y fin para ver el histórico.")
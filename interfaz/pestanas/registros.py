@@ -0,0 +1,103 @@
+"""Pestaña 4: base de datos de registros, historial paginado y exportación."""
+import streamlit as st
+
+from interfaz.agregados import obtener_consulta_historial
+from interfaz.comun import fragmento
+from pesca.diagnostico import etapa
+from pesca.exportacion import FORMATOS, exportar
+from pesca.paginacion import COLUMNAS_FILTRO, COLUMNAS_ORDEN, FiltroHistorial
+
+
+# --- ARCHIVOS DE EXPORTACIÓN (compartidos, se generan sólo al pedirlos) ---
+# cache_resource: todas las sesiones reciben el mismo objeto bytes (cache_data lo copiaría en cada lectura)
+@st.cache_resource(max_entries=8, ttl=3600, show_spinner="Generando archivo...")
+def generar_exportacion(_leer_registros, version, alcance, clave_filtro, formato, columnas):
+    # Los registros se leen sólo si el archivo no está en caché (con SQLite, el historial filtrado)
+    df = _leer_registros()
+    with etapa(f"exportacion_{formato}", len(df)):
+        return exportar(df, formato, columnas)
+
+# --- FILTROS DEL HISTORIAL ---
+def controles_consulta_historial(vista):
+    col_fechas, col_orden, col_sentido = st.columns([2, 2, 1], vertical_alignment="bottom")
+    # Sin rango elegido se ve todo el historial, incluidos los registros sin fecha válida
+    limites = vista.limites()
+    rango = col_fechas.date_input(
+        "Rango de fechas (vacío: todo el historial)", value=(),
+        min_value=limites[0] if limites else None, max_value=limites[1] if limites else None, key="datos_rango"
+    )
+    orden = col_orden.selectbox("Ordenar por", COLUMNAS_ORDEN, key="datos_orden")
+    ascendente = col_sentido.toggle("Ascendente", value=False, key="datos_ascendente")
+
+    columnas_filtro = st.columns(len(COLUMNAS_FILTRO))
+    filtros = tuple(
+        (col, tuple(columna.multiselect(f"Filtrar {col}", options=vista.categorias(col), key=f"datos_filtro_{col}")))
+        for col, columna in zip(COLUMNAS_FILTRO, columnas_filtro)
+    )
+
+    desde, hasta = rango if isinstance(rango, tuple) and len(rango) == 2 else (None, None)
+    return FiltroHistorial(desde, hasta, filtros), orden, ascendente
+
+@fragmento
+def pestana_datos(vista, fecha_seleccionada):
+    version = vista.version
+    st.header("Base de Datos de Registros")
+    ver_todo = st.toggle("Ver todo el historial", value=False)
+
+    columnas_a_mostrar = ['Marca temporal', 'Fecha_Filtro', 'Cuadrilla', 'Producto', 'Calibre', 'Calidad', 'N° de Coche', 'Lote', 'Bandejas']
+    config_columnas = {
+        "Marca temporal": st.column_config.DatetimeColumn("Marca temporal", format="DD/MM/YYYY HH:mm"),
+        "Fecha_Filtro": st.column_config.DateColumn("Fecha", format="DD/MM/YYYY"),
+        "Bandejas": st.column_config.NumberColumn("Bandejas", format="%d"),
+        "Lote": st.column_config.TextColumn("Lote"), 
+    }
+    
+    if ver_todo:
+        # Historial paginado: filtros y orden se aplican en el servidor y sólo se envía una página
+        filtro, orden, ascendente = controles_consulta_historial(vista)
+        with etapa("consulta_historial") as medida:
+            resultado = obtener_consulta_historial(vista, version, filtro)
+            medida.filas = resultado.total
+        leer_registros = resultado.registros
+        # La exportación sigue el filtro, no el orden de la tabla
+        alcance, clave_filtro = "historial", repr(filtro)
+
+        col_tamano, col_pagina = st.columns(2)
+        tamano = col_tamano.selectbox("Filas por página", [50, 100, 250, 500], index=1, key="datos_tamano")
+        total_paginas = resultado.paginas(tamano)
+        numero = col_pagina.number_input(f"Página (de {total_paginas})", min_value=1, max_value=total_paginas, value=1, step=1, key="datos_pagina")
+
+        pagina = resultado.pagina(numero, tamano, orden, ascendente)
+        # Sin subconjuntos de columnas (df[cols] copiaría los datos): se eligen al mostrar y al exportar
+        cols_finales = [c for c in columnas_a_mostrar if c in pagina.columns]
+        inicio = (numero - 1) * tamano
+        st.info(
+            f"Mostrando registros {min(inicio + 1, resultado.total)}–{inicio + len(pagina)} de {resultado.total:,} "
+            f"filtrados ({vista.total():,} en el historial completo)."
+        )
+        st.dataframe(pagina, use_container_width=True, hide_index=True, column_order=cols_finales, column_config=config_columnas)
+    else:
+        df_dia = vista.dia(fecha_seleccionada)
+        cols_finales = [c for c in columnas_a_mostrar if c in df_dia.columns]
+        leer_registros = lambda: df_dia
+        alcance, clave_filtro = str(fecha_seleccionada), ""
+        st.info(f"Mostrando registros del día {fecha_seleccionada}: {len(df_dia)} registros.")
+        st.dataframe(df_dia, use_container_width=True, hide_index=True, column_order=cols_finales, column_config=config_columnas)
+    
+    # --- EXPORTACIÓN (sólo cuando se pide) ---
+    st.markdown("##### 📥 Exportar")
+    col_formato, col_preparar = st.columns([3, 1], vertical_alignment="bottom")
+    formato = col_formato.selectbox(
+        "Formato", options=list(FORMATOS), format_func=lambda f: FORMATOS[f][0], key="formato_exportacion"
+    )
+    clave_exportacion = (version, alcance, clave_filtro, formato)
+    if col_preparar.button("Preparar archivo", use_container_width=True):
+        st.session_state["exportacion"] = clave_exportacion
+
+    if st.session_state.get("exportacion") == clave_exportacion:
+        st.download_button(
+            label=f"📥 Descargar {FORMATOS[formato][0]}",
+            data=generar_exportacion(leer_registros, version, alcance, clave_filtro, formato, tuple(cols_finales)),
+            file_name=f'registros_pesca_{alcance}.{formato}',
+            mime=FORMATOS[formato][1]
+        )
@@ -0,0 +1,130 @@
+"""Pestaña 2: rendimiento (descarga vs. envasado por lote), del día y de un período."""
+from datetime import timedelta
+
+import streamlit as st
+
+from interfaz.agregados import obtener_envasado
+from interfaz.carga import obtener_almacen_descargas
+from interfaz.comun import fragmento
+from interfaz.graficos import figura_rendimiento
+from pesca.diagnostico import etapa
+from pesca.rendimiento import calcular_rendimiento
+
+CONFIG_RENDIMIENTO = {
+    "Fecha_Filtro": st.column_config.DateColumn("Fecha", format="DD/MM/YYYY"),
+    "Lote": st.column_config.TextColumn("Lote"),
+    "Descarga (tn)": st.column_config.NumberColumn("Descarga (tn)", format="%.3f t"),
+    "Envasado (tn)": st.column_config.NumberColumn("Envasado (tn)", format="%.3f t"),
+    "Rendimiento (%)": st.column_config.NumberColumn("Rendimiento (%)", format="%.1f%%"),
+    "Lotes sin descarga": st.column_config.NumberColumn("Lotes sin descarga", format="%d"),
+}
+
+
+@fragmento
+def pestana_rendimiento(vista, reporte, fecha_seleccionada, hoy_peru, kilos_por_bandeja):
+    almacen = obtener_almacen_descargas()
+    st.markdown("### ⚡ Cálculo de Rendimiento Diario")
+
+    if reporte.vacio:
+        st.warning(f"⚠️ No hay datos para el día: {fecha_seleccionada}")
+    else:
+        # 1. Envasado del día y descargas ya registradas para esa fecha
+        df_rend = reporte.resumen_por('Lote', kilos_por_bandeja)[['Lote', 'Tn']]
+        df_rend.columns = ['Lote', 'Envasado (tn)']
+        df_rend['Lote'] = df_rend['Lote'].astype(str)
+        registradas = almacen.del_dia(fecha_seleccionada)
+        df_rend['Descarga (tn)'] = df_rend['Lote'].map(registradas).fillna(0.0)
+
+        # Reordenamos columnas
+        df_rend = df_rend[['Lote', 'Descarga (tn)', 'Envasado (tn)']]
+
+        st.info("📝 Ingresa los valores de 'Descarga (tn)' y presiona el botón para guardarlos. Quedan registrados por fecha y lote.")
+
+        # 2. Formulario
+        with st.form("calculo_rendimiento_form"):
+            edited_df = st.data_editor(
+                df_rend,
+                column_config={
+                    "Lote": st.column_config.TextColumn("Lote", disabled=True),
+                    "Envasado (tn)": st.column_config.NumberColumn("Envasado (tn)", format="%.3f t", disabled=True),
+                    "Descarga (tn)": st.column_config.NumberColumn(
+                        "Descarga (tn)",
+                        format="%.3f t",
+                        min_value=0.0,
+                        step=0.001,
+                        required=True
+                    ),
+                },
+                hide_index=True,
+                use_container_width=True,
+                key="editor_rendimiento"
+            )
+
+            # Botón de guardado
+            guardar_btn = st.form_submit_button("💾 Guardar y calcular rendimiento")
+
+        if guardar_btn and not edited_df.empty:
+            almacen.guardar(fecha_seleccionada, dict(zip(edited_df['Lote'], edited_df['Descarga (tn)'])))
+            st.success("✅ Descargas guardadas.")
+
+        # 3. Resultados del día (con lo que esté registrado)
+        with etapa("rendimiento_dia"):
+            rendimiento_dia = calcular_rendimiento(
+                obtener_envasado(vista, vista.version, fecha_seleccionada, fecha_seleccionada),
+                almacen.leer(fecha_seleccionada, fecha_seleccionada),
+                kilos_por_bandeja
+            )
+        if rendimiento_dia.descarga > 0:
+            st.markdown("#### 📊 Resultados por Lote")
+            st.dataframe(
+                rendimiento_dia.por_lote.drop(columns='Fecha_Filtro'),
+                column_config=CONFIG_RENDIMIENTO,
+                hide_index=True,
+                use_container_width=True
+            )
+
+    # ==========================================================================
+    # RENDIMIENTO DE UN PERÍODO (todas las descargas registradas en el rango)
+    # ==========================================================================
+    st.markdown("---")
+    st.markdown("### 📈 Rendimiento del Período")
+    rango_fechas = st.date_input(
+        "Selecciona Rango de Fechas:",
+        value=(hoy_peru - timedelta(days=30), hoy_peru),
+        max_value=hoy_peru,
+        key="rendimiento_rango"
+    )
+    if not (isinstance(rango_fechas, tuple) and len(rango_fechas) == 2):
+        st.info("Selecciona una fecha de inicio y fin para ver el rendimiento del período.")
+        return
+
+    fecha_inicio, fecha_fin = rango_fechas
+    with etapa("rendimiento_periodo") as medida:
+        rendimiento = calcular_rendimiento(
+            obtener_envasado(vista, vista.version, fecha_inicio, fecha_fin),
+            almacen.leer(fecha_inicio, fecha_fin),
+            kilos_por_bandeja
+        )
+        medida.filas = len(rendimiento.por_lote)
+
+    if rendimiento.descarga <= 0:
+        st.warning("⚠️ No hay descargas registradas en el rango de fechas seleccionado.")
+        return
+
+    col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+    col_r1.metric("Descarga", f"{rendimiento.descarga:,.2f} t 🚢")
+    col_r2.metric("Envasado", f"{rendimiento.envasado:,.2f} t 📦")
+    col_r3.metric("Rendimiento", f"{rendimiento.porcentaje:,.1f} % ⚡")
+    col_r4.metric("Lotes sin descarga", f"{rendimiento.lotes_sin_descarga} 📝")
+    st.caption("El rendimiento considera sólo los lotes con descarga registrada.")
+
+    st.subheader("Rendimiento Diario")
+    st.plotly_chart(figura_rendimiento(rendimiento.por_dia), use_container_width=True)
+
+    col_dias, col_lotes = st.columns(2)
+    with col_dias:
+        st.markdown("##### 🗓️ Por Día")
+        st.dataframe(rendimiento.por_dia, column_config=CONFIG_RENDIMIENTO, hide_index=True, use_container_width=True)
+    with col_lotes:
+        st.markdown("##### 🏷️ Por Lote")
+        st.dataframe(rendimiento.por_lote_periodo, column_config=CONFIG_RENDIMIENTO, hide_index=True, use_container_width=True)
@@ -0,0 +1,137 @@
+"""Pestaña 1: reporte diario."""
+import streamlit as st
+
+from interfaz.agregados import obtener_ritmo
+from interfaz.comun import fragmento
+from interfaz.graficos import figura_actividad, figura_ritmo, mostrar_echarts, opciones_toneladas
+from pesca.diagnostico import etapa
+from pesca.ritmo import UMBRAL_PAUSA_MINUTOS, VENTANAS_MINUTOS
+
+
+@fragmento
+def pestana_reporte(df_filtrado, reporte, version, fecha_seleccionada, kilos_por_bandeja):
+    if df_filtrado.empty:
+        st.warning(f"⚠️ No hay datos para el día: {fecha_seleccionada}")
+    else:
+        # KPIs
+        st.markdown("### 📊 Métricas del Día")
+        col_fecha, col1, col2, col3, col4, col5 = st.columns(6)
+        
+        col_fecha.metric("Fecha", f"{fecha_seleccionada.strftime('%d/%m/%Y')} 🗓️")
+        col1.metric("Bandejas", f"{reporte.bandejas:,.0f} 📦")
+        col2.metric("Toneladas", f"{reporte.toneladas(kilos_por_bandeja):,.2f} t ⚖️")
+        col3.metric("Lotes", f"{len(reporte.lotes)} 🏷️")
+        col4.metric("Cuadrillas", f"{len(reporte.cuadrillas)} 👷")
+        
+        # MÉTRICA CÁLCULO POR VOLUMEN
+        col5.metric("N° Coches completos", f"{reporte.coches:,.2f} 🛒")
+        
+        st.markdown("---")
+
+        # =======================================================
+        # TIMELINE SCATTER (REVERTIDO A PLOTLY)
+        # =======================================================
+        st.subheader("⏰ Actividad en Tiempo Real")
+        col_vista, col_intervalo = st.columns([3, 1])
+        modo = col_vista.radio("Vista", ["Registros", "Densidad", "Por hora"], horizontal=True, key="vista_timeline")
+        minutos = None
+        if modo == "Densidad":
+            minutos = col_intervalo.selectbox("Intervalo", [5, 15], index=1, format_func=lambda m: f"{m} min", key="intervalo_densidad")
+
+        with etapa("grafico_timeline", len(df_filtrado)):
+            fig_timeline = figura_actividad(df_filtrado, version, fecha_seleccionada, modo, minutos, kilos_por_bandeja)
+        st.plotly_chart(fig_timeline, use_container_width=True)
+        st.markdown("---")
+
+        # =======================================================
+        # RITMO POR CUADRILLA (BANDEJAS POR HORA)
+        # =======================================================
+        st.subheader("🚀 Ritmo por Cuadrilla")
+        with etapa("ritmo", len(df_filtrado)):
+            ritmo = obtener_ritmo(df_filtrado, version, fecha_seleccionada)
+        if ritmo.vacio:
+            st.info("No hay registros con hora para calcular el ritmo.")
+        else:
+            minutos_ritmo = st.radio(
+                "Ventana móvil", list(VENTANAS_MINUTOS), horizontal=True, format_func=lambda m: f"{m} min", key="ventana_ritmo"
+            )
+            with etapa("grafico_ritmo", len(ritmo.curvas)):
+                fig_ritmo = figura_ritmo(ritmo, version, fecha_seleccionada, minutos_ritmo)
+            st.plotly_chart(fig_ritmo, use_container_width=True)
+
+            config_ritmo = {
+                "Inicio": st.column_config.DatetimeColumn("Inicio", format="HH:mm"),
+                "Fin": st.column_config.DatetimeColumn("Fin", format="HH:mm"),
+                "Bandejas": st.column_config.NumberColumn(format="%.0f"),
+                "Horas": st.column_config.NumberColumn(format="%.2f"),
+                "Minutos en pausa": st.column_config.NumberColumn(format="%.0f"),
+                "Pausa más larga (min)": st.column_config.NumberColumn(format="%.0f"),
+                **{c: st.column_config.NumberColumn(format="%.0f") for c in ritmo.resumen.columns if "(b/h)" in c or "Bandejas/hora" in c},
+            }
+            st.dataframe(ritmo.resumen, column_config=config_ritmo, hide_index=True, use_container_width=True)
+            st.caption(f"Pausa: más de {UMBRAL_PAUSA_MINUTOS} min sin registros de la cuadrilla. 'Bandejas/hora activa' descuenta las pausas.")
+            if not ritmo.pausas.empty:
+                with st.expander(f"⏸️ Pausas ({len(ritmo.pausas)})"):
+                    st.dataframe(
+                        ritmo.pausas, hide_index=True, use_container_width=True,
+                        column_config={
+                            "Desde": st.column_config.DatetimeColumn("Desde", format="HH:mm"),
+                            "Hasta": st.column_config.DatetimeColumn("Hasta", format="HH:mm"),
+                            "Minutos": st.column_config.NumberColumn(format="%.0f"),
+                        }
+                    )
+        st.markdown("---")
+        
+        # =======================================================
+        # BARRAS CON ECHARTS (AGRUPADAS Y APILADAS)
+        # =======================================================
+        col_graf1, col_graf2 = st.columns(2)
+        
+        with col_graf1:
+            st.subheader("🏭 Toneladas por Cuadrilla")
+            # Opciones compartidas por día y versión (el pivote lo arma ReporteDiario)
+            with etapa("grafico_barras"):
+                opt_cuadrilla = opciones_toneladas(reporte, version, fecha_seleccionada, 'Cuadrilla', kilos_por_bandeja, "Cuadrilla", 90)
+            mostrar_echarts(opt_cuadrilla, "350px")
+            
+        with col_graf2:
+            st.subheader("📦 Toneladas por Lote")
+            with etapa("grafico_barras"):
+                opt_lote = opciones_toneladas(reporte, version, fecha_seleccionada, 'Lote', kilos_por_bandeja, "N° Lote", 0)
+            mostrar_echarts(opt_lote, "350px")
+
+        st.markdown("---")
+
+        # Tablas Detalle
+        st.subheader("📋 Tablas de Detalle Global")
+        
+        config_tablas = {
+            "Kg": st.column_config.NumberColumn(format="%.1f"), 
+            "Tn": st.column_config.NumberColumn(format="%.2f"), 
+            "Bandejas": st.column_config.NumberColumn(format="%.0f"),
+            "Lote": st.column_config.TextColumn("N° Lote"),
+            "N° Coches": st.column_config.NumberColumn("N° Coches", format="%.2f"), 
+        }
+        
+        # --- TABLA 1: Resumen por Lote ---
+        st.markdown("##### 📦 Resumen por Lote")
+        resumen_lote = reporte.resumen_por('Lote', kilos_por_bandeja)
+        st.dataframe(resumen_lote, column_config=config_tablas, hide_index=True, use_container_width=True)
+
+        # --- TABLA 2: Resumen por Cuadrilla ---
+        st.markdown("##### 👷 Resumen por Cuadrilla")
+        resumen_cuadrilla = reporte.resumen_por('Cuadrilla', kilos_por_bandeja)
+        config_cuadrilla = config_tablas.copy(); config_cuadrilla.pop("Lote", None) 
+        st.dataframe(resumen_cuadrilla, column_config=config_cuadrilla, hide_index=True, use_container_width=True)
+        
+        st.markdown("---")
+        st.subheader("🧩 Detalle de Productos por Lote")
+        if len(reporte.lotes) > 0:
+            for lote_actual in reporte.lotes:
+                st.markdown(f"#### 🏷️ Lote: {lote_actual}")
+                tabla_detalle = reporte.detalle_lote(lote_actual, kilos_por_bandeja)
+                st.dataframe(
+                    tabla_detalle, column_config={"Toneladas": st.column_config.NumberColumn(format="%.2f t")},
+                    hide_index=True, use_container_width=True
+                )
+                st.markdown("<br>", unsafe_allow_html=True)
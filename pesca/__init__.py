@@ -0,0 +1 @@
+"""Lógica de datos del Dashboard de Producción Pesquera (sin dependencias de Streamlit)."""
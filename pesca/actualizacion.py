@@ -0,0 +1,104 @@
+"""Mantiene el DataFrame procesado al día aplicando los cambios de la hoja."""
+import logging
+from dataclasses import dataclass
+
+import pandas as pd
+
+from pesca.diagnostico import etapa
+from pesca.indice import IndiceFechas, ordenar_por_marca
+from pesca.ingesta import concatenar_registros
+from pesca.rollup import RollupDiario
+from pesca.snapshot import cargar_snapshot, guardar_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DatosProcesados:
+    """Registros ordenados junto con las estructuras derivadas que se mantienen con ellos."""
+    datos: pd.DataFrame
+    indice: IndiceFechas
+    rollup: RollupDiario
+
+    @classmethod
+    def desde_registros(cls, datos):
+        datos = ordenar_por_marca(datos)
+        return cls(datos, IndiceFechas(datos), RollupDiario.desde_registros(datos))
+
+
+class ActualizadorDatos:
+    """Une sincronización, procesamiento y snapshot local.
+
+    `procesar` recibe filas crudas (texto) y devuelve filas procesadas; sólo se
+    aplica a las filas nuevas salvo que la hoja se haya releído completa.
+    """
+
+    def __init__(self, sincronizador, procesar, ruta_snapshot=None):
+        self.sincronizador = sincronizador
+        self.procesar = procesar
+        self.ruta_snapshot = ruta_snapshot
+        self.procesados = None
+
+    def cargar_local(self):
+        """Carga el snapshot local, si existe, sin tocar la red. Devuelve `DatosProcesados` o None."""
+        if self.procesados is None and self.ruta_snapshot:
+            with etapa("carga_snapshot") as medida:
+                snapshot = cargar_snapshot(self.ruta_snapshot)
+                if snapshot is not None:
+                    datos, estado = snapshot
+                    self.procesados = DatosProcesados.desde_registros(datos)
+                    self.sincronizador.restaurar(estado)
+                    medida.filas = len(datos)
+        return self.procesados
+
+    def actualizar(self):
+        """Aplica los cambios de la hoja sobre los datos (o el snapshot) y los devuelve."""
+        self.cargar_local()
+
+        # Posición de lectura previa: si algo falla antes de incorporar las filas se vuelve a ella,
+        # y el próximo refresco las pide de nuevo (si no, quedarían perdidas también en el snapshot)
+        estado = self.sincronizador.estado()
+        try:
+            with etapa("carga") as medida:
+                cambios = self.sincronizador.sincronizar()
+                medida.filas = len(cambios.filas)
+            if not cambios.reinicio and cambios.filas.empty:
+                return self.procesados
+
+            with etapa("parseo", len(cambios.filas)):
+                nuevas = self.procesar(cambios.filas)
+            with etapa("indice") as medida:
+                if cambios.reinicio:
+                    procesados = DatosProcesados.desde_registros(nuevas)
+                else:
+                    procesados = self._agregar(nuevas)
+                medida.filas = len(procesados.datos)
+        except Exception:
+            self.sincronizador.restaurar(estado)
+            raise
+        self.procesados = procesados
+
+        with etapa("snapshot", len(self.procesados.datos)):
+            self._guardar_snapshot()
+        return self.procesados
+
+    def _agregar(self, nuevas):
+        previos = self.procesados
+        # Las respuestas llegan casi siempre en orden: normalmente no se reordena nada
+        datos = ordenar_por_marca(concatenar_registros(previos.datos, nuevas))
+        indice = IndiceFechas(datos)
+        if previos.datos.empty:
+            rollup = RollupDiario.desde_registros(datos)
+        else:
+            rollup = previos.rollup.actualizar(indice, nuevas)
+        return DatosProcesados(datos, indice, rollup)
+
+    def _guardar_snapshot(self):
+        datos = self.procesados.datos
+        if not self.ruta_snapshot or datos.empty:
+            return
+        try:
+            guardar_snapshot(self.ruta_snapshot, datos, self.sincronizador.estado())
+        except Exception:
+            # El snapshot es sólo una aceleración: un fallo no debe tumbar la carga
+            logger.exception("No se pudo guardar el snapshot en %s", self.ruta_snapshot)
@@ -0,0 +1,158 @@
+"""Sumas acumuladas de Bandejas por día calendario × Cuadrilla × Producto.
+
+Con `acumulado[k]` = bandejas de los k primeros días, el total de cualquier
+rango de días es `acumulado[j] - acumulado[i]`: dos lecturas, sin importar el
+largo del historial. Se construyen con un único `np.bincount` sobre el rollup
+diario (unas pocas filas por día), cada vez que éste se actualiza.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from pesca.agregaciones import a_toneladas
+
+PERIODOS_COMPARACION = ["Período anterior", "Mismo período del año anterior"]
+
+
+def _codigos(serie):
+    """Códigos enteros (-1 = vacío) y nombres de los valores presentes, ordenados."""
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos, valores = pd.factorize(serie, sort=True)
+        return codigos, [str(v) for v in valores]
+    codigos = serie.cat.codes.to_numpy()
+    # Sólo las categorías que aparecen (las categorías de la unión pueden no estar en esta tabla)
+    usados = np.flatnonzero(np.bincount(codigos[codigos >= 0], minlength=len(serie.cat.categories)))
+    posicion = np.full(len(serie.cat.categories), -1)
+    posicion[usados] = np.arange(len(usados))
+    return np.where(codigos >= 0, posicion[codigos], -1), serie.cat.categories[usados].astype(str).tolist()
+
+
+@dataclass(frozen=True)
+class AcumuladosDiarios:
+    """`acumulado` tiene forma (días + 1, cuadrillas, productos) y `acumulado[0]` es cero."""
+    inicio: object
+    cuadrillas: list
+    productos: list
+    acumulado: np.ndarray
+
+    @classmethod
+    def desde_rollup(cls, tabla):
+        """A partir de una tabla con Fecha_Filtro, Cuadrilla, Producto y Bandejas (ver `calcular_rollup`)."""
+        if tabla.empty:
+            return cls(None, [], [], np.zeros((1, 0, 0)))
+        dias = tabla['Fecha_Filtro'].to_numpy(dtype='datetime64[D]')
+        cuadrilla, cuadrillas = _codigos(tabla['Cuadrilla'])
+        producto, productos = _codigos(tabla['Producto'])
+        validos = ~np.isnat(dias) & (cuadrilla >= 0) & (producto >= 0)
+        if not validos.any():
+            return cls(None, [], [], np.zeros((1, 0, 0)))
+
+        dias, cuadrilla, producto = dias[validos], cuadrilla[validos], producto[validos]
+        inicio = dias.min()
+        dia = (dias - inicio).astype(np.int64)
+        forma = (int(dia.max()) + 1, len(cuadrillas), len(productos))
+        celda = (dia * forma[1] + cuadrilla) * forma[2] + producto
+        bandejas = np.nan_to_num(tabla['Bandejas'].to_numpy(dtype='float64')[validos])
+        por_dia = np.bincount(celda, weights=bandejas, minlength=int(np.prod(forma))).reshape(forma)
+
+        acumulado = np.zeros((forma[0] + 1,) + forma[1:])
+        np.cumsum(por_dia, axis=0, out=acumulado[1:])
+        return cls(inicio, cuadrillas, productos, acumulado)
+
+    @property
+    def nbytes(self):
+        return self.acumulado.nbytes
+
+    def _posicion(self, fecha):
+        """Días anteriores a `fecha` dentro del historial (0 .. número de días)."""
+        if self.inicio is None:
+            return 0
+        dias = (np.datetime64(fecha, 'D') - self.inicio).astype(np.int64)
+        return int(np.clip(dias, 0, len(self.acumulado) - 1))
+
+    def total(self, desde, hasta):
+        """Bandejas (cuadrillas × productos) entre `desde` y `hasta`, ambos incluidos."""
+        i = self._posicion(desde)
+        j = max(i, self._posicion(hasta + timedelta(days=1)))
+        return self.acumulado[j] - self.acumulado[i]
+
+    def _filas(self, cuadrillas):
+        if cuadrillas is None:
+            return np.arange(len(self.cuadrillas))
+        return np.flatnonzero(np.isin(self.cuadrillas, [str(c) for c in cuadrillas]))
+
+    def bandejas(self, desde, hasta, cuadrillas=None):
+        """Total de bandejas del rango (de las `cuadrillas` dadas, o de todas)."""
+        return float(self.total(desde, hasta)[self._filas(cuadrillas)].sum())
+
+    def por_cuadrilla(self, desde, hasta, cuadrillas=None):
+        filas = self._filas(cuadrillas)
+        valores = self.total(desde, hasta)[filas].sum(axis=1)
+        return pd.Series(valores, index=pd.Index([self.cuadrillas[f] for f in filas], name='Cuadrilla'), name='Bandejas')
+
+    def por_producto(self, desde, hasta, cuadrillas=None):
+        valores = self.total(desde, hasta)[self._filas(cuadrillas)].sum(axis=0)
+        return pd.Series(valores, index=pd.Index(self.productos, name='Producto'), name='Bandejas')
+
+
+def periodo_anterior(desde, hasta, modo):
+    """Rango con el que se compara [desde, hasta] según `modo` (ver `PERIODOS_COMPARACION`)."""
+    if modo == "Mismo período del año anterior":
+        return _un_anio_antes(desde), _un_anio_antes(hasta)
+    dias = (hasta - desde).days + 1
+    return desde - timedelta(days=dias), desde - timedelta(days=1)
+
+
+def _un_anio_antes(fecha):
+    try:
+        return fecha.replace(year=fecha.year - 1)
+    except ValueError:
+        # 29 de febrero
+        return fecha.replace(year=fecha.year - 1, day=28)
+
+
+@dataclass(frozen=True)
+class ComparacionPeriodos:
+    """Toneladas del período actual y del anterior, en total, por Cuadrilla y por Producto."""
+    actual: float
+    anterior: float
+    por_cuadrilla: pd.DataFrame
+    por_producto: pd.DataFrame
+
+    @property
+    def variacion(self):
+        return (self.actual - self.anterior) / self.anterior * 100 if self.anterior else np.nan
+
+
+def _tabla_comparacion(actual, anterior, kilos_por_bandeja):
+    # NumPy hasta el final: un solo DataFrame por tabla (se rehace con cada rango)
+    toneladas_actual = a_toneladas(actual.to_numpy(), kilos_por_bandeja)
+    toneladas_anterior = a_toneladas(anterior.to_numpy(), kilos_por_bandeja)
+    diferencia = toneladas_actual - toneladas_anterior
+    with np.errstate(divide='ignore', invalid='ignore'):
+        porcentaje = np.where(toneladas_anterior > 0, diferencia / toneladas_anterior * 100, np.nan)
+    filas = np.flatnonzero((toneladas_actual > 0) | (toneladas_anterior > 0))
+    filas = filas[np.argsort(-toneladas_actual[filas], kind='stable')]
+    return pd.DataFrame({
+        actual.index.name: actual.index.to_numpy()[filas],
+        'Actual (t)': toneladas_actual[filas],
+        'Anterior (t)': toneladas_anterior[filas],
+        'Δ (t)': diferencia[filas],
+        'Δ (%)': porcentaje[filas],
+    })
+
+
+def comparar_periodos(acumulados, actual, anterior, kilos_por_bandeja, cuadrillas=None):
+    """`actual` y `anterior` son rangos (desde, hasta); cada total son dos lecturas de `acumulados`."""
+    return ComparacionPeriodos(
+        actual=a_toneladas(acumulados.bandejas(*actual, cuadrillas), kilos_por_bandeja),
+        anterior=a_toneladas(acumulados.bandejas(*anterior, cuadrillas), kilos_por_bandeja),
+        por_cuadrilla=_tabla_comparacion(
+            acumulados.por_cuadrilla(*actual, cuadrillas), acumulados.por_cuadrilla(*anterior, cuadrillas), kilos_por_bandeja
+        ),
+        por_producto=_tabla_comparacion(
+            acumulados.por_producto(*actual, cuadrillas), acumulados.por_producto(*anterior, cuadrillas), kilos_por_bandeja
+        ),
+    )
@@ -0,0 +1,101 @@
+"""Agregaciones del reporte diario.
+
+Todas las agregaciones suman `Bandejas`; los kilos y toneladas son una escala
+lineal de las bandejas y se aplican sobre el resultado ya agregado. Así, cambiar
+el "Kg promedio por Bandeja" no obliga a recalcular nada sobre los registros.
+"""
+from dataclasses import dataclass
+
+import pandas as pd
+
+
+def _a_float64(bandejas):
+    # Bandejas se guarda como float32; los resultados se entregan en float64
+    # para que el redondeo de etiquetas y tablas sea exacto
+    return bandejas.astype('float64') if hasattr(bandejas, 'astype') else float(bandejas)
+
+
+def a_kilos(bandejas, kilos_por_bandeja):
+    return _a_float64(bandejas) * kilos_por_bandeja
+
+
+def a_toneladas(bandejas, kilos_por_bandeja):
+    return _a_float64(bandejas) * kilos_por_bandeja / 1000
+
+
+# Bandejas que entran en un coche completo
+BANDEJAS_POR_COCHE = 50
+
+DIMENSIONES_CUBO = ['Lote', 'Cuadrilla', 'Producto', 'Calidad', 'Calibre']
+
+
+@dataclass(frozen=True)
+class ReporteDiario:
+    """Todo lo que muestra la pestaña Reporte para un día, derivado de un único groupby.
+
+    `cubo` tiene las bandejas por (Lote, Cuadrilla, Producto, Calidad, Calibre);
+    cada vista vuelve a sumar ese cubo, que tiene pocas filas, en vez de los registros.
+    """
+    cubo: pd.Series
+    detalle: pd.Series
+    bandejas: float
+    lotes: list
+    cuadrillas: list
+
+    @classmethod
+    def desde_registros(cls, registros):
+        cubo = registros.groupby(DIMENSIONES_CUBO, observed=True)['Bandejas'].sum().astype('float64')
+        detalle = cubo.groupby(level=['Lote', 'Producto', 'Calidad', 'Calibre'], observed=True).sum()
+        return cls(
+            cubo=cubo,
+            detalle=detalle,
+            bandejas=float(cubo.sum()),
+            lotes=cubo.index.get_level_values('Lote').unique().sort_values().tolist(),
+            cuadrillas=cubo.index.get_level_values('Cuadrilla').unique().sort_values().tolist(),
+        )
+
+    @property
+    def vacio(self):
+        return self.cubo.empty
+
+    @property
+    def coches(self):
+        return self.bandejas / BANDEJAS_POR_COCHE
+
+    def toneladas(self, kilos_por_bandeja):
+        return a_toneladas(self.bandejas, kilos_por_bandeja)
+
+    def kpis(self, kilos_por_bandeja):
+        """Métricas del día tal como se muestran en la cabecera del Reporte."""
+        return {
+            'Bandejas': self.bandejas,
+            'Toneladas': self.toneladas(kilos_por_bandeja),
+            'Lotes': len(self.lotes),
+            'Cuadrillas': len(self.cuadrillas),
+            'N° Coches': self.coches,
+        }
+
+    def bandejas_por(self, dimension):
+        return self.cubo.groupby(level=dimension, observed=True).sum()
+
+    def pivote_toneladas(self, dimension, kilos_por_bandeja):
+        """Toneladas con `dimension` como filas y un producto por columna."""
+        bandejas = self.cubo.groupby(level=[dimension, 'Producto'], observed=True).sum()
+        return a_toneladas(bandejas.unstack('Producto', fill_value=0), kilos_por_bandeja)
+
+    def resumen_por(self, dimension, kilos_por_bandeja):
+        """Tabla de detalle global: N° Coches, Bandejas, Kg y Tn por `dimension`."""
+        bandejas = self.bandejas_por(dimension)
+        return pd.DataFrame({
+            dimension: bandejas.index.astype(str),
+            'N° Coches': bandejas.to_numpy() / BANDEJAS_POR_COCHE,
+            'Bandejas': bandejas.to_numpy(),
+            'Kg': a_kilos(bandejas.to_numpy(), kilos_por_bandeja),
+            'Tn': a_toneladas(bandejas.to_numpy(), kilos_por_bandeja),
+        })
+
+    def detalle_lote(self, lote, kilos_por_bandeja):
+        """Toneladas por Producto, Calidad y Calibre de un lote."""
+        tabla = self.detalle.xs(lote, level='Lote').reset_index(name='Toneladas')
+        tabla['Toneladas'] = a_toneladas(tabla['Toneladas'], kilos_por_bandeja)
+        return tabla
@@ -0,0 +1,124 @@
+"""Instantánea de datos compartida por todas las sesiones del dashboard.
+
+Un único hilo en segundo plano refresca los datos cada `intervalo` segundos y
+publica una nueva `Instantanea`; las sesiones sólo leen la instantánea vigente,
+por lo que la carga sobre la API de Sheets no depende del número de usuarios.
+
+La `version` de la instantánea sólo sube cuando cambia la huella de los datos
+(`huella_datos`): un refresco sin respuestas nuevas conserva la versión y todo
+lo que se haya calculado y guardado en caché con ella sigue valiendo.
+"""
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from pesca.indice import IndiceFechas
+from pesca.rollup import RollupDiario
+
+logger = logging.getLogger(__name__)
+
+# Filas del final que entran en el hash de la huella
+FILAS_HUELLA = 256
+
+
+def huella_datos(datos, total=None):
+    """Clave barata del contenido: nº de filas, última marca temporal y hash de las últimas filas.
+
+    `datos` puede ser sólo la cola de los registros si se indica el `total`.
+    No detecta ediciones en filas antiguas que no cambien el número de filas.
+    """
+    total = len(datos) if total is None else total
+    if datos.empty:
+        return f"{total}"
+    cola = datos.iloc[-FILAS_HUELLA:]
+    h = hashlib.blake2b(pd.util.hash_pandas_object(cola, index=False).to_numpy().tobytes(), digest_size=8)
+    return f"{total}|{cola['Marca temporal'].max()}|{h.hexdigest()}"
+
+
+@dataclass(frozen=True)
+class Instantanea:
+    """Datos procesados en un momento dado. Es de sólo lectura: no modificar `datos`."""
+    datos: pd.DataFrame
+    indice: IndiceFechas
+    rollup: RollupDiario
+    version: int
+    actualizado: datetime
+    huella: str = ""
+
+
+class CacheDatos:
+    def __init__(self, cargar, intervalo=60):
+        self._cargar = cargar
+        self.intervalo = intervalo
+        self.ultimo_error = None
+        self._instantanea = None
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def obtener(self):
+        """Devuelve la instantánea vigente; la primera llamada carga de forma síncrona."""
+        instantanea = self._instantanea
+        if instantanea is None:
+            instantanea = self.refrescar()
+        return instantanea
+
+    def refrescar(self):
+        """Recarga los datos ahora y publica una nueva instantánea.
+
+        Si la carga falla se anota en `ultimo_error` y se propaga; la instantánea vigente no cambia.
+        """
+        with self._lock:
+            try:
+                instantanea = self._publicar(self._cargar())
+            except Exception as e:
+                self.ultimo_error = e
+                raise
+            self.ultimo_error = None
+            return instantanea
+
+    def publicar(self, procesados):
+        """Publica datos ya disponibles (p. ej. el snapshot local) sin recargar."""
+        with self._lock:
+            return self._publicar(procesados)
+
+    def _publicar(self, procesados):
+        ahora = datetime.now(timezone.utc)
+        vigente = self._instantanea
+        if vigente is not None and procesados.datos is vigente.datos:
+            huella = vigente.huella
+        else:
+            huella = huella_datos(procesados.datos)
+        if vigente is not None and huella == vigente.huella:
+            # Sin datos nuevos: misma versión (y mismas cachés), sólo cambia la hora de la comprobación
+            self._instantanea = replace(vigente, actualizado=ahora)
+            return self._instantanea
+        version = vigente.version + 1 if vigente else 1
+        self._instantanea = Instantanea(
+            procesados.datos, procesados.indice, procesados.rollup, version, ahora, huella
+        )
+        return self._instantanea
+
+    def iniciar(self, inmediato=False):
+        """Arranca el hilo de refresco; con `inmediato` el primer refresco no espera el intervalo."""
+        if self._hilo is None or not self._hilo.is_alive():
+            self._detener.clear()
+            self._hilo = threading.Thread(target=self._bucle, args=(inmediato,), name="refresco-datos", daemon=True)
+            self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+
+    def _bucle(self, inmediato):
+        espera = 0 if inmediato else self.intervalo
+        while not self._detener.wait(espera):
+            espera = self.intervalo
+            try:
+                self.refrescar()
+            except Exception:
+                # Se mantiene la última instantánea válida (el error queda en `ultimo_error`)
+                logger.exception("Error al refrescar los datos")
@@ -0,0 +1,172 @@
+"""Medición de tiempos por etapa del pipeline (carga, parseo, filtro, agregación, gráficos, exportación).
+
+Cada `etapa(...)` registra tiempo de reloj, filas y variación de memoria residente:
+- en la ejecución en curso (ver `nueva_ejecucion`), para el panel de diagnóstico;
+- en una ventana móvil por etapa compartida por el proceso, para p50/p95;
+- como una línea JSON en el logger `pesca.diagnostico` (nivel INFO).
+
+`informe_memoria` separa lo que se guarda una sola vez para todo el proceso
+(datos compartidos) de lo que cada sesión guarda aparte (su estado).
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Mediciones que se conservan por etapa para los percentiles
+VENTANA = 500
+# Segundos sin ejecuciones tras los que una sesión deja de contarse como activa
+VENTANA_SESIONES = 600
+
+_TAMANO_PAGINA = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_ejecucion = ContextVar("ejecucion_diagnostico", default=None)
+_historial = {}
+_sesiones = {}
+_lock = threading.Lock()
+
+
+@dataclass
+class Medicion:
+    etapa: str
+    segundos: float
+    filas: Optional[int] = None
+    memoria_mb: Optional[float] = None  # variación de memoria residente durante la etapa
+
+
+def memoria_residente():
+    """Bytes de memoria residente del proceso, o None si no se puede leer (sólo Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _TAMANO_PAGINA
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def nueva_ejecucion():
+    """Empieza a acumular las mediciones de esta ejecución del script y devuelve la lista."""
+    mediciones = []
+    _ejecucion.set(mediciones)
+    return mediciones
+
+
+class _Etapa:
+    def __init__(self, filas):
+        self.filas = filas
+
+
+@contextmanager
+def etapa(nombre, filas=None):
+    """Mide el bloque. Las filas pueden fijarse después con `medida.filas = n`."""
+    medida = _Etapa(filas)
+    memoria_inicial = memoria_residente()
+    inicio = time.perf_counter()
+    try:
+        yield medida
+    finally:
+        segundos = time.perf_counter() - inicio
+        memoria_final = memoria_residente()
+        delta = None
+        if memoria_inicial is not None and memoria_final is not None:
+            delta = (memoria_final - memoria_inicial) / 2**20
+        registrar(Medicion(nombre, segundos, None if medida.filas is None else int(medida.filas), delta))
+
+
+def registrar(medicion):
+    mediciones = _ejecucion.get()
+    if mediciones is not None:
+        mediciones.append(medicion)
+    with _lock:
+        _historial.setdefault(medicion.etapa, deque(maxlen=VENTANA)).append(medicion.segundos)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"evento": "etapa", "hilo": threading.current_thread().name, **asdict(medicion)}))
+
+
+def percentiles():
+    """p50/p95 (ms) por etapa sobre las últimas `VENTANA` mediciones del proceso."""
+    with _lock:
+        tiempos = {nombre: np.fromiter(valores, dtype="float64") for nombre, valores in _historial.items()}
+    filas = [
+        {
+            "Etapa": nombre,
+            "N": len(t),
+            "p50 (ms)": np.percentile(t, 50) * 1000,
+            "p95 (ms)": np.percentile(t, 95) * 1000,
+            "Máx (ms)": t.max() * 1000,
+        }
+        for nombre, t in sorted(tiempos.items())
+    ]
+    return pd.DataFrame(filas, columns=["Etapa", "N", "p50 (ms)", "p95 (ms)", "Máx (ms)"])
+
+
+def tabla_ejecucion(mediciones):
+    """Mediciones de una ejecución como DataFrame para mostrar."""
+    tabla = pd.DataFrame(
+        [
+            {"Etapa": m.etapa, "ms": m.segundos * 1000, "Filas": m.filas, "Δ memoria (MB)": m.memoria_mb}
+            for m in mediciones
+        ],
+        columns=["Etapa", "ms", "Filas", "Δ memoria (MB)"],
+    )
+    return tabla.astype({"Filas": "Int64"})
+
+
+def activar_log(nivel=logging.INFO):
+    """Envía las líneas JSON a stderr (si nadie configuró ya un handler)."""
+    logger.setLevel(nivel)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+
+
+# --- MEMORIA ---
+def tamano_bytes(valor):
+    """Bytes aproximados de un objeto (profundo para DataFrame/Series, `nbytes` para arrays)."""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        uso = valor.memory_usage(index=True, deep=True)
+        return int(uso.sum() if isinstance(valor, pd.DataFrame) else uso)
+    if hasattr(valor, "nbytes"):
+        return int(valor.nbytes)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamano_bytes(k) + tamano_bytes(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return sys.getsizeof(valor) + sum(tamano_bytes(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+def registrar_sesion(id_sesion, estado):
+    """Anota que la sesión se ejecutó y cuánto ocupa su estado (`st.session_state`)."""
+    bytes_estado = tamano_bytes(dict(estado))
+    with _lock:
+        _sesiones[id_sesion] = (time.monotonic(), bytes_estado)
+
+
+def sesiones_activas(ventana=VENTANA_SESIONES):
+    """Bytes de estado de cada sesión con ejecuciones en los últimos `ventana` segundos."""
+    limite = time.monotonic() - ventana
+    with _lock:
+        for id_sesion in [i for i, (visto, _) in _sesiones.items() if visto < limite]:
+            del _sesiones[id_sesion]
+        return [bytes_estado for _, bytes_estado in _sesiones.values()]
+
+
+def informe_memoria(compartido, sesion):
+    """MB de cada objeto: `compartido` ({nombre: objeto}, una copia por proceso) y `sesion` (estado de esta sesión)."""
+    filas = [
+        {"Ámbito": ambito, "Objeto": str(nombre), "MB": tamano_bytes(objeto) / 2**20}
+        for ambito, objetos in (("Compartido", compartido), ("Esta sesión", sesion))
+        for nombre, objeto in objetos.items()
+    ]
+    return pd.DataFrame(filas, columns=["Ámbito", "Objeto", "MB"])
@@ -0,0 +1,118 @@
+"""Exportación de registros a XLSX, CSV y Parquet.
+
+Los archivos se escriben por bloques de filas, de modo que la memoria de trabajo
+no crece con el tamaño del historial (más allá del propio archivo generado).
+`columnas` se aplica también por bloque: el DataFrame recibido (que puede ser
+el compartido por todas las sesiones) nunca se copia entero.
+"""
+import io
+
+import pandas as pd
+
+TAMANO_BLOQUE = 50_000
+# Filas que se miran para estimar el ancho de cada columna en Excel
+FILAS_MUESTRA_ANCHOS = 2_000
+
+FORMATOS = {
+    "xlsx": ("Excel (.xlsx)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV", "text/csv"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet"),
+}
+
+
+def _bloques(df, columnas, tamano=TAMANO_BLOQUE):
+    for inicio in range(0, len(df), tamano):
+        yield df.iloc[inicio:inicio + tamano][columnas]
+
+
+def exportar(df, formato, columnas=None):
+    """Devuelve el contenido del archivo en `formato` ("xlsx", "csv" o "parquet").
+
+    `columnas` elige y ordena las columnas exportadas (por defecto, todas).
+    """
+    columnas = list(df.columns if columnas is None else columnas)
+    if formato == "xlsx":
+        return exportar_xlsx(df, columnas)
+    if formato == "csv":
+        return exportar_csv(df, columnas)
+    if formato == "parquet":
+        return exportar_parquet(df, columnas)
+    raise ValueError(f"Formato de exportación desconocido: {formato}")
+
+
+def exportar_csv(df, columnas):
+    buffer = io.BytesIO()
+    # BOM para que Excel reconozca los acentos al abrir el CSV
+    buffer.write("\ufeff".encode("utf-8"))
+    for i, bloque in enumerate(_bloques(df, columnas)):
+        if "Fecha_Filtro" in bloque.columns:
+            bloque = bloque.assign(Fecha_Filtro=bloque["Fecha_Filtro"].dt.strftime("%d/%m/%Y"))
+        texto = bloque.to_csv(index=False, header=i == 0, date_format="%d/%m/%Y %H:%M:%S")
+        buffer.write(texto.encode("utf-8"))
+    if df.empty:
+        buffer.write(df[columnas].to_csv(index=False).encode("utf-8"))
+    return buffer.getvalue()
+
+
+def exportar_parquet(df, columnas):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    buffer = io.BytesIO()
+    # Tipos inferidos sobre todas las filas, sin copiar las columnas elegidas
+    completo = pa.Schema.from_pandas(df, preserve_index=False)
+    esquema = pa.schema([completo.field(c) for c in columnas])
+    with pq.ParquetWriter(buffer, esquema) as writer:
+        for bloque in _bloques(df, columnas):
+            writer.write_table(pa.Table.from_pandas(bloque, schema=esquema, preserve_index=False))
+    return buffer.getvalue()
+
+
+def anchos_columnas(df, filas_muestra=FILAS_MUESTRA_ANCHOS):
+    """Ancho de cada columna para Excel, estimado sobre una muestra de filas."""
+    muestra = df.head(filas_muestra)
+    anchos = []
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(muestra[col]):
+            largo = 16
+        else:
+            largo = muestra[col].astype(str).str.len().max()
+            largo = 0 if pd.isna(largo) else int(largo)
+        anchos.append(max(largo, len(str(col))) + 2)
+    return anchos
+
+
+def exportar_xlsx(df, columnas, nombre_hoja="BaseDatos"):
+    import xlsxwriter
+
+    buffer = io.BytesIO()
+    # constant_memory: cada fila se vuelca a disco al pasar a la siguiente
+    workbook = xlsxwriter.Workbook(buffer, {"constant_memory": True, "remove_timezone": True})
+    worksheet = workbook.add_worksheet(nombre_hoja)
+
+    negrita = workbook.add_format({"bold": True, "border": 1})
+    formato_fecha_hora = workbook.add_format({"num_format": "dd/mm/yyyy hh:mm"})
+    formato_fecha = workbook.add_format({"num_format": "dd/mm/yyyy"})
+    formatos = []
+    for col in columnas:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            formatos.append(formato_fecha if col == "Fecha_Filtro" else formato_fecha_hora)
+        else:
+            formatos.append(None)
+
+    for i, ancho in enumerate(anchos_columnas(df.head(FILAS_MUESTRA_ANCHOS)[columnas])):
+        worksheet.set_column(i, i, ancho)
+    worksheet.write_row(0, 0, [str(c) for c in columnas], negrita)
+
+    fila = 1
+    for bloque in _bloques(df, columnas):
+        # object + None: xlsxwriter recibe tipos de Python y celdas vacías en lugar de NaN/NaT
+        valores = bloque.astype(object).where(bloque.notna(), None)
+        for registro in valores.itertuples(index=False, name=None):
+            for c, valor in enumerate(registro):
+                if valor is not None:
+                    worksheet.write(fila, c, valor, formatos[c])
+            fila += 1
+
+    workbook.close()
+    return buffer.getvalue()
@@ -0,0 +1,444 @@
+"""Orígenes de datos intercambiables para el dashboard.
+
+Cada fuente entrega, en cada ejecución, una `VistaDatos`: una lectura coherente
+(una misma `version`) sobre la que el dashboard pide registros por rango de días
+y cuadrillas. Esos filtros se resuelven en el propio backend:
+
+- `FuenteSheets`: la instantánea en memoria sincronizada con Google Sheets
+  (búsqueda binaria en el índice por día y resumen diario materializado).
+- `FuenteSQLite`: `WHERE` sobre un índice (Fecha_Filtro, Marca temporal);
+  el resumen del Histórico se calcula con `GROUP BY` en la base.
+- `FuenteParquet`: filtros de pyarrow, que saltan los row groups cuyas
+  estadísticas de Fecha_Filtro/Cuadrilla quedan fuera del filtro.
+
+Las tres devuelven los mismos tipos que `procesar_registros`.
+
+Uso para pasar el historial a SQLite:
+    python -m pesca.fuentes datos_pesca.parquet historial.db
+"""
+import os
+import sqlite3
+import sys
+import threading
+from abc import ABC, abstractmethod
+from contextlib import closing
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from pesca.acumulados import AcumuladosDiarios
+from pesca.cache import FILAS_HUELLA, huella_datos
+from pesca.ingesta import COLUMNAS_CATEGORICAS
+from pesca.paginacion import ResultadoConsulta, ResultadoEnMemoria, filtrar_historial
+from pesca.rollup import CLAVES_ROLLUP, calcular_rollup
+
+TABLA_SQLITE = "registros"
+_FORMATO_MARCA_SQL = "%Y-%m-%d %H:%M:%S"
+_FORMATO_DIA_SQL = "%Y-%m-%d"
+
+
+def tipar_registros(datos):
+    """Tipos de `procesar_registros` sobre registros leídos de un backend (fechas como texto, etc.)."""
+    for col in ('Marca temporal', 'Fecha_Filtro', 'Primera', 'Ultima'):
+        if col in datos.columns and not pd.api.types.is_datetime64_any_dtype(datos[col]):
+            datos[col] = pd.to_datetime(datos[col], errors='coerce')
+    if 'Bandejas' in datos.columns:
+        datos['Bandejas'] = pd.to_numeric(datos['Bandejas'], errors='coerce').fillna(0).astype('float32')
+    if 'N° de Coche' in datos.columns:
+        datos['N° de Coche'] = datos['N° de Coche'].astype(str)
+    for col in COLUMNAS_CATEGORICAS:
+        if col in datos.columns and not isinstance(datos[col].dtype, pd.CategoricalDtype):
+            datos[col] = datos[col].astype('category')
+    return datos
+
+
+class VistaDatos(ABC):
+    """Lectura de una versión concreta de los datos. Los registros vienen ordenados
+    por "Marca temporal"; `desde`/`hasta` son fechas incluidas (None: sin límite)."""
+
+    version = 0
+    actualizado = None
+
+    @abstractmethod
+    def registros(self, desde=None, hasta=None, cuadrillas=None, columnas=None):
+        """Registros del rango y las cuadrillas (todas las columnas, o sólo `columnas`)."""
+
+    def dia(self, fecha):
+        return self.registros(fecha, fecha)
+
+    def rollup(self, desde, hasta, cuadrillas=None):
+        """Resumen día × Cuadrilla × Producto × Lote (columnas de `calcular_rollup`)."""
+        columnas = CLAVES_ROLLUP + ['Bandejas', 'Marca temporal']
+        return calcular_rollup(self.registros(desde, hasta, cuadrillas, columnas))
+
+    def consultar_historial(self, filtro):
+        """Registros que cumplen un `pesca.paginacion.FiltroHistorial`, para paginarlos."""
+        return ResultadoEnMemoria(filtrar_historial(self, filtro))
+
+    def acumulados(self):
+        """Sumas acumuladas de Bandejas por día × Cuadrilla × Producto de todo el historial."""
+        return AcumuladosDiarios.desde_rollup(self.rollup(None, None))
+
+    @abstractmethod
+    def categorias(self, columna):
+        """Valores distintos de una columna, ordenados."""
+
+    def cuadrillas(self):
+        return self.categorias('Cuadrilla')
+
+    @abstractmethod
+    def limites(self):
+        """Primer y último día con registros, o None si no hay datos."""
+
+    @abstractmethod
+    def total(self):
+        """Número total de registros."""
+
+    def en_memoria(self):
+        """{nombre: objeto} que la vista mantiene en memoria, compartidos por todas las sesiones."""
+        return {}
+
+
+class FuenteDatos(ABC):
+    """Origen de datos: `obtener()` devuelve la vista vigente y `refrescar()` fuerza una relectura."""
+
+    ultimo_error = None
+
+    @abstractmethod
+    def obtener(self):
+        """Vista vigente de los datos."""
+
+    def refrescar(self):
+        return self.obtener()
+
+
+# --- GOOGLE SHEETS (instantánea en memoria) ---
+class VistaInstantanea(VistaDatos):
+    def __init__(self, instantanea):
+        self.instantanea = instantanea
+        self.version = instantanea.version
+        self.actualizado = instantanea.actualizado
+
+    def registros(self, desde=None, hasta=None, cuadrillas=None, columnas=None):
+        indice = self.instantanea.indice
+        if desde is None and hasta is None:
+            datos = indice.datos
+        else:
+            datos = indice.rango(desde if desde is not None else '1970-01-01', hasta if hasta is not None else '2262-01-01')
+        if cuadrillas is not None:
+            datos = datos[datos['Cuadrilla'].isin(cuadrillas).to_numpy()]
+        return datos if columnas is None else datos[columnas]
+
+    def rollup(self, desde, hasta, cuadrillas=None):
+        return self.instantanea.rollup.rango(desde, hasta, cuadrillas)
+
+    def acumulados(self):
+        return self.instantanea.rollup.acumulados
+
+    def categorias(self, columna):
+        serie = self.instantanea.datos[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            return list(serie.cat.categories)
+        return sorted(serie.dropna().unique())
+
+    def cuadrillas(self):
+        return self.instantanea.rollup.cuadrillas()
+
+    def limites(self):
+        datos = self.instantanea.datos
+        if 'Fecha_Filtro' not in datos.columns or datos['Fecha_Filtro'].isna().all():
+            return None
+        dias = datos['Fecha_Filtro'].dropna()
+        return dias.iloc[0].date(), dias.iloc[-1].date()
+
+    def total(self):
+        return len(self.instantanea.datos)
+
+    def en_memoria(self):
+        instantanea = self.instantanea
+        return {
+            "Registros": instantanea.datos,
+            "Índice de días": instantanea.indice,
+            "Rollup": instantanea.rollup.tabla,
+            "Índice del rollup": instantanea.rollup.indice,
+            "Acumulados": instantanea.rollup.acumulados,
+        }
+
+
+class FuenteSheets(FuenteDatos):
+    """Datos de la hoja de Google, mantenidos al día por `CacheDatos`."""
+
+    def __init__(self, cache_datos):
+        self.cache_datos = cache_datos
+
+    @property
+    def ultimo_error(self):
+        return self.cache_datos.ultimo_error
+
+    def obtener(self):
+        return VistaInstantanea(self.cache_datos.obtener())
+
+    def refrescar(self):
+        return VistaInstantanea(self.cache_datos.refrescar())
+
+
+# --- ARCHIVOS LOCALES ---
+class _FuenteArchivo(FuenteDatos):
+    """Fuente sobre un archivo. Cuando el archivo cambia (mtime o tamaño) se calcula
+    la huella de su contenido; la versión sólo sube si la huella es distinta."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._firma = None
+        self._huella = None
+        self._vista = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def obtener(self):
+        estado = os.stat(self.ruta)
+        firma = (estado.st_mtime_ns, estado.st_size)
+        with self._lock:
+            if firma != self._firma:
+                self._firma = firma
+                huella = self._calcular_huella()
+                if huella != self._huella:
+                    self._huella = huella
+                    self._version += 1
+                    actualizado = datetime.fromtimestamp(estado.st_mtime, timezone.utc)
+                    self._vista = self._crear_vista(self._version, actualizado)
+            return self._vista
+
+    @abstractmethod
+    def _calcular_huella(self):
+        """Huella del contenido actual del archivo."""
+
+    @abstractmethod
+    def _crear_vista(self, version, actualizado):
+        """Vista del archivo para una nueva versión."""
+
+
+class _VistaArchivo(VistaDatos):
+    def __init__(self, ruta, version, actualizado):
+        self.ruta = ruta
+        self.version = version
+        self.actualizado = actualizado
+        # Valores que no cambian dentro de una versión (opciones de filtros, límites, total, días leídos)
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def _memorizar(self, clave, calcular):
+        with self._lock:
+            if clave not in self._memo:
+                self._memo[clave] = calcular()
+            return self._memo[clave]
+
+    def dia(self, fecha):
+        # Se pide en cada ejecución (y dos veces con la pestaña Datos): una lectura por día y versión
+        return self._memorizar(("dia", fecha), lambda: self.registros(fecha, fecha))
+
+    def acumulados(self):
+        return self._memorizar("acumulados", super().acumulados)
+
+
+# --- SQLITE ---
+def _consultar_sqlite(ruta, sql, parametros=()):
+    # Una conexión por consulta: sqlite3 no comparte conexiones entre hilos
+    with closing(sqlite3.connect(f"file:{ruta}?mode=ro", uri=True)) as conexion:
+        return pd.read_sql_query(sql, conexion, params=parametros)
+
+
+class VistaSQLite(_VistaArchivo):
+    def _consultar(self, sql, parametros=()):
+        return _consultar_sqlite(self.ruta, sql, parametros)
+
+    @staticmethod
+    def _donde(desde, hasta, cuadrillas, filtros=None):
+        """`filtros` es un {columna: valores} adicional a `cuadrillas`; una lista vacía no deja filas."""
+        condiciones, parametros = [], []
+        if desde is not None:
+            condiciones.append('"Fecha_Filtro" >= ?')
+            parametros.append(pd.Timestamp(desde).strftime(_FORMATO_DIA_SQL))
+        if hasta is not None:
+            condiciones.append('"Fecha_Filtro" <= ?')
+            parametros.append(pd.Timestamp(hasta).strftime(_FORMATO_DIA_SQL))
+        filtros = dict(filtros or {})
+        if cuadrillas is not None:
+            filtros['Cuadrilla'] = cuadrillas
+        for columna, valores in filtros.items():
+            condiciones.append(f'"{columna}" IN ({", ".join("?" * len(valores))})' if valores else '0')
+            parametros.extend(str(v) for v in valores)
+        return (" WHERE " + " AND ".join(condiciones)) if condiciones else "", parametros
+
+    def _leer_registros(self, seleccion, donde, parametros):
+        datos = self._consultar(
+            f'SELECT {seleccion} FROM {TABLA_SQLITE}{donde} ORDER BY "Marca temporal" IS NULL, "Marca temporal", rowid', parametros
+        )
+        return tipar_registros(datos)
+
+    def registros(self, desde=None, hasta=None, cuadrillas=None, columnas=None):
+        seleccion = ", ".join(f'"{c}"' for c in columnas) if columnas else "*"
+        return self._leer_registros(seleccion, *self._donde(desde, hasta, cuadrillas))
+
+    def consultar_historial(self, filtro):
+        return ResultadoSQLite(self, filtro)
+
+    def rollup(self, desde, hasta, cuadrillas=None):
+        claves = ", ".join(f'"{c}"' for c in CLAVES_ROLLUP)
+        donde, parametros = self._donde(desde, hasta, cuadrillas)
+        tabla = self._consultar(
+            f'SELECT {claves}, SUM("Bandejas") AS "Bandejas", COUNT(*) AS "Registros", '
+            f'MIN("Marca temporal") AS "Primera", MAX("Marca temporal") AS "Ultima" '
+            f'FROM {TABLA_SQLITE}{donde} GROUP BY {claves} ORDER BY {claves}',
+            parametros,
+        )
+        return tipar_registros(tabla)
+
+    def categorias(self, columna):
+        return self._memorizar(("categorias", columna), lambda: self._consultar(
+            f'SELECT DISTINCT "{columna}" AS valor FROM {TABLA_SQLITE} WHERE "{columna}" IS NOT NULL ORDER BY 1'
+        )['valor'].tolist())
+
+    def limites(self):
+        def calcular():
+            fila = self._consultar(f'SELECT MIN("Fecha_Filtro") AS i, MAX("Fecha_Filtro") AS f FROM {TABLA_SQLITE}').iloc[0]
+            if pd.isna(fila['i']):
+                return None
+            return pd.Timestamp(fila['i']).date(), pd.Timestamp(fila['f']).date()
+        return self._memorizar("limites", calcular)
+
+    def total(self):
+        return self._memorizar("total", lambda: int(self._consultar(f"SELECT COUNT(*) AS n FROM {TABLA_SQLITE}")['n'].iloc[0]))
+
+
+class ResultadoSQLite(ResultadoConsulta):
+    """Historial filtrado sin traerlo: cada página es un `ORDER BY … LIMIT/OFFSET` en la base."""
+
+    def __init__(self, vista, filtro):
+        self._vista = vista
+        self._donde, self._parametros = vista._donde(filtro.desde, filtro.hasta, None, filtro.activos())
+        self._total = int(vista._consultar(f"SELECT COUNT(*) AS n FROM {TABLA_SQLITE}{self._donde}", self._parametros)['n'].iloc[0])
+
+    @property
+    def total(self):
+        return self._total
+
+    def pagina(self, numero, tamano, orden='Marca temporal', ascendente=False):
+        # Mismo orden que en memoria: estable respecto de la Marca temporal y el orden de carga
+        claves = ['"Marca temporal" IS NULL', '"Marca temporal"', 'rowid']
+        if orden != 'Marca temporal':
+            claves.insert(0, f'"{orden}"')
+        sentido = "" if ascendente else " DESC"
+        datos = self._vista._consultar(
+            f'SELECT * FROM {TABLA_SQLITE}{self._donde} ORDER BY {", ".join(c + sentido for c in claves)} LIMIT ? OFFSET ?',
+            self._parametros + [tamano, (numero - 1) * tamano],
+        )
+        return tipar_registros(datos)
+
+    def registros(self):
+        return self._vista._leer_registros("*", self._donde, self._parametros)
+
+
+class FuenteSQLite(_FuenteArchivo):
+    """Historial en una base SQLite escrita con `guardar_sqlite`."""
+
+    def _calcular_huella(self):
+        total = int(_consultar_sqlite(self.ruta, f"SELECT COUNT(*) AS n FROM {TABLA_SQLITE}")['n'].iloc[0])
+        cola = _consultar_sqlite(self.ruta, f"SELECT * FROM {TABLA_SQLITE} ORDER BY rowid DESC LIMIT {FILAS_HUELLA}")
+        # Tipada: las marcas sin fecha (al final de la tabla) llegan como NULL entre textos
+        return huella_datos(tipar_registros(cola), total)
+
+    def _crear_vista(self, version, actualizado):
+        return VistaSQLite(self.ruta, version, actualizado)
+
+
+def guardar_sqlite(ruta, datos):
+    """Escribe (reemplazando) los registros procesados en una base SQLite con índices para los filtros."""
+    tabla = datos.copy()
+    tabla['Marca temporal'] = tabla['Marca temporal'].dt.strftime(_FORMATO_MARCA_SQL)
+    tabla['Fecha_Filtro'] = tabla['Fecha_Filtro'].dt.strftime(_FORMATO_DIA_SQL)
+    for col in COLUMNAS_CATEGORICAS:
+        if col in tabla.columns:
+            tabla[col] = tabla[col].astype(str)
+    temporal = f"{ruta}.tmp"
+    if os.path.exists(temporal):
+        os.remove(temporal)
+    with closing(sqlite3.connect(temporal)) as conexion:
+        tabla.to_sql(TABLA_SQLITE, conexion, index=False, chunksize=50_000)
+        conexion.execute(f'CREATE INDEX idx_{TABLA_SQLITE}_fecha ON {TABLA_SQLITE} ("Fecha_Filtro", "Marca temporal")')
+        conexion.execute(f'CREATE INDEX idx_{TABLA_SQLITE}_cuadrilla ON {TABLA_SQLITE} ("Cuadrilla", "Fecha_Filtro")')
+        conexion.commit()
+    os.replace(temporal, ruta)
+
+
+# --- PARQUET ---
+class VistaParquet(_VistaArchivo):
+    def _leer(self, columnas=None, filtros=None):
+        import pyarrow.parquet as pq
+        return pq.read_table(self.ruta, columns=columnas, filters=filtros or None, memory_map=True).to_pandas()
+
+    def _vacio(self, columnas=None):
+        import pyarrow.parquet as pq
+        datos = pq.read_schema(self.ruta).empty_table().to_pandas()
+        return datos if columnas is None else datos[columnas]
+
+    def registros(self, desde=None, hasta=None, cuadrillas=None, columnas=None):
+        filtros = []
+        if desde is not None:
+            filtros.append(('Fecha_Filtro', '>=', pd.Timestamp(desde)))
+        if hasta is not None:
+            filtros.append(('Fecha_Filtro', '<=', pd.Timestamp(hasta)))
+        if cuadrillas is not None:
+            if not cuadrillas:
+                return self._vacio(columnas)
+            filtros.append(('Cuadrilla', 'in', [str(c) for c in cuadrillas]))
+        # El archivo se escribe ordenado por "Marca temporal" (ver `guardar_snapshot`)
+        return tipar_registros(self._leer(columnas, filtros))
+
+    def categorias(self, columna):
+        def calcular():
+            serie = self._leer([columna])[columna]
+            return sorted(serie.dropna().astype(str).unique())
+        return self._memorizar(("categorias", columna), calcular)
+
+    def limites(self):
+        def calcular():
+            dias = self._leer(['Fecha_Filtro'])['Fecha_Filtro'].dropna()
+            return None if dias.empty else (dias.min().date(), dias.max().date())
+        return self._memorizar("limites", calcular)
+
+    def total(self):
+        import pyarrow.parquet as pq
+        return self._memorizar("total", lambda: pq.ParquetFile(self.ruta).metadata.num_rows)
+
+
+class FuenteParquet(_FuenteArchivo):
+    """Registros procesados en un archivo Parquet (p. ej. el snapshot local del dashboard)."""
+
+    def _calcular_huella(self):
+        import pyarrow.parquet as pq
+        archivo = pq.ParquetFile(self.ruta, memory_map=True)
+        if archivo.num_row_groups == 0:
+            return huella_datos(pd.DataFrame(), 0)
+        # Sólo se lee el último row group
+        cola = archivo.read_row_group(archivo.num_row_groups - 1).to_pandas()
+        return huella_datos(cola, archivo.metadata.num_rows)
+
+    def _crear_vista(self, version, actualizado):
+        return VistaParquet(self.ruta, version, actualizado)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("Uso: python -m pesca.fuentes <snapshot.parquet> <historial.db>", file=sys.stderr)
+        return 2
+    origen, destino = argv
+    datos = VistaParquet(origen, 0, None).registros()
+    guardar_sqlite(destino, datos)
+    print(f"{len(datos):,} registros escritos en {destino}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Construcción de opciones de ECharts para los gráficos del dashboard.
+
+Las opciones se memorizan por el contenido del agregado: si el pivote no cambió,
+se devuelve el mismo diccionario ya construido (no se debe modificar).
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+_MAX_OPCIONES = 128
+_opciones = OrderedDict()
+_lock = threading.Lock()
+
+
+def huella_frame(df):
+    """Hash del contenido de un DataFrame (valores, índice y columnas)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update(repr(df.columns.tolist()).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _memorizar(clave, construir):
+    with _lock:
+        if clave in _opciones:
+            _opciones.move_to_end(clave)
+            return _opciones[clave]
+    opciones = construir()
+    with _lock:
+        _opciones[clave] = opciones
+        if len(_opciones) > _MAX_OPCIONES:
+            _opciones.popitem(last=False)
+    return opciones
+
+
+def opciones_barras_apiladas(pivote, nombre_eje, rotacion_etiquetas=0):
+    """Barras horizontales apiladas: filas del pivote en el eje Y, una serie por columna."""
+    clave = ("barras_apiladas", huella_frame(pivote), nombre_eje, rotacion_etiquetas)
+    return _memorizar(clave, lambda: _construir_barras_apiladas(pivote, nombre_eje, rotacion_etiquetas))
+
+
+def _construir_barras_apiladas(pivote, nombre_eje, rotacion_etiquetas):
+    categorias = pivote.index.astype(str).tolist()
+    productos = pivote.columns.astype(str).tolist()
+
+    # Redondeo y ceros -> null (sin etiqueta) en un solo paso vectorizado
+    valores = np.round(pivote.to_numpy(dtype="float64"), 1)
+    datos = np.where(valores > 0, valores, None)
+
+    series = [
+        {
+            "name": producto,
+            "type": "bar",
+            "stack": "total", # BARRAS APILADAS
+            "data": datos[:, i].tolist(),
+            "label": {"show": True, "position": "inside", "formatter": "{c}", "fontSize": 10, "fontWeight": "bold"},
+            "emphasis": {"focus": "series"}
+        }
+        for i, producto in enumerate(productos)
+    ]
+
+    return {
+        "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
+        "legend": {"data": productos, "bottom": 0, "type": "plain", "width": "90%", "left": "center"},
+        "grid": {
+            "left": "10%", "right": "5%", "bottom": "20%", "containLabel": True,
+            "show": True, "borderColor": "#000000", "borderWidth": 1
+        },
+        "xAxis": [{
+            "type": "value",
+            "name": "Toneladas (t)",
+            "nameLocation": "middle",
+            "nameGap": 30,
+            "minInterval": 1,
+            "axisLabel": {"fontWeight": "bold"},
+            "nameTextStyle": {"fontWeight": "bold"}
+        }],
+        "yAxis": [{
+            "type": "category",
+            "data": categorias,
+            "name": nombre_eje,
+            "nameLocation": "end",
+            "nameGap": 10,
+            "axisTick": {"alignWithLabel": True},
+            "axisLabel": {"fontWeight": "bold", "rotate": rotacion_etiquetas, "interval": 0},
+            "nameTextStyle": {"fontWeight": "bold"}
+        }],
+        "series": series
+    }
+
+
+# Por encima de este número de puntos la línea de tiempo se dibuja con WebGL
+UMBRAL_WEBGL = 1000
+
+
+@dataclass(frozen=True)
+class DensidadActividad:
+    """Bandejas por Cuadrilla (filas) e intervalo de tiempo (columnas)."""
+    cuadrillas: list
+    inicios: np.ndarray
+    bandejas: np.ndarray
+    registros: np.ndarray
+
+
+def densidad_actividad(registros, minutos=15):
+    """Agrupa los registros del día en intervalos de `minutos` por Cuadrilla, con NumPy."""
+    marca = registros['Marca temporal'].to_numpy(dtype='datetime64[ns]')
+    cuadrilla = registros['Cuadrilla']
+    codigos = cuadrilla.cat.codes.to_numpy()
+    # Código -1: registro sin Cuadrilla (NULL en SQLite/Parquet)
+    validos = ~np.isnat(marca) & (codigos >= 0)
+    marca, codigos = marca[validos], codigos[validos]
+    if marca.size == 0:
+        return DensidadActividad([], np.array([], dtype='datetime64[ns]'), np.zeros((0, 0)), np.zeros((0, 0), dtype=int))
+
+    usados, fila = np.unique(codigos, return_inverse=True)
+
+    paso = np.timedelta64(minutos, 'm')
+    primero = marca.min()
+    origen = primero - (primero - primero.astype('datetime64[D]')) % paso
+    columna = ((marca - origen) // paso).astype(np.int64)
+    n_filas, n_columnas = len(usados), int(columna.max()) + 1
+
+    celda = fila * n_columnas + columna
+    bandejas = registros['Bandejas'].to_numpy(dtype='float64')[validos]
+    return DensidadActividad(
+        cuadrillas=cuadrilla.cat.categories[usados].astype(str).tolist(),
+        inicios=origen + np.arange(n_columnas) * paso,
+        bandejas=np.bincount(celda, weights=bandejas, minlength=n_filas * n_columnas).reshape(n_filas, n_columnas),
+        registros=np.bincount(celda, minlength=n_filas * n_columnas).reshape(n_filas, n_columnas),
+    )
+
+
+DIAS_SEMANA = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+
+
+@dataclass(frozen=True)
+class MapaHorario:
+    """Bandejas por Cuadrilla × día de la semana × hora del día (0-23).
+
+    `dias` es el número de fechas con registros para cada día de la semana, para
+    expresar los mapas como promedio por día.
+    """
+    cuadrillas: list
+    bandejas: np.ndarray
+    dias: np.ndarray
+
+    @property
+    def vacio(self):
+        return not self.cuadrillas
+
+    def por_cuadrilla(self):
+        """(n_cuadrillas, 24): bandejas promedio por día con registros."""
+        return self.bandejas.sum(axis=1) / max(int(self.dias.sum()), 1)
+
+    def por_dia_semana(self):
+        """(7, 24): bandejas promedio por fecha de cada día de la semana (todas las cuadrillas)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.dias[:, None] > 0, self.bandejas.sum(axis=0) / self.dias[:, None], np.nan)
+
+
+def mapa_horario(registros):
+    """Acumula las bandejas en una sola pasada de `np.bincount` sobre códigos enteros."""
+    marca = registros['Marca temporal'].to_numpy(dtype='datetime64[ns]')
+    codigos = registros['Cuadrilla'].cat.codes.to_numpy()
+    validos = ~np.isnat(marca) & (codigos >= 0)
+    marca = marca[validos]
+    if marca.size == 0:
+        return MapaHorario([], np.zeros((0, 7, 24)), np.zeros(7, dtype=int))
+
+    # Cuadrillas presentes y días con registros por conteo (sin ordenar como np.unique)
+    codigos = codigos[validos]
+    usados = np.flatnonzero(np.bincount(codigos))
+    fila = np.zeros(usados[-1] + 1, dtype=np.int64)
+    fila[usados] = np.arange(len(usados))
+    dia = marca.astype('datetime64[D]').astype(np.int64)
+    hora = (marca.astype(np.int64) // 3_600_000_000_000) % 24
+    # 1970-01-01 fue jueves: +3 deja el lunes en 0
+    dia_semana = (dia + 3) % 7
+
+    n_filas = len(usados)
+    celda = (fila[codigos] * 7 + dia_semana) * 24 + hora
+    bandejas = np.nan_to_num(registros['Bandejas'].to_numpy(dtype='float64')[validos])
+    primer_dia = dia.min()
+    fechas = primer_dia + np.flatnonzero(np.bincount(dia - primer_dia))
+    return MapaHorario(
+        cuadrillas=registros['Cuadrilla'].cat.categories[usados].astype(str).tolist(),
+        bandejas=np.bincount(celda, weights=bandejas, minlength=n_filas * 7 * 24).reshape(n_filas, 7, 24),
+        dias=np.bincount((fechas + 3) % 7, minlength=7),
+    )
@@ -0,0 +1,48 @@
+"""Índice por día sobre los datos ordenados por "Marca temporal".
+
+Con los registros ordenados, las filas de un día (o de un rango de días) son un
+bloque contiguo: basta una búsqueda binaria sobre el array de días para obtener
+un corte `iloc[i:j]` que es una vista, sin recorrer ni copiar el historial.
+"""
+import numpy as np
+
+
+def ordenar_por_marca(datos):
+    """Ordena por "Marca temporal" (NaT al final) sólo si hace falta."""
+    if datos.empty or esta_ordenado(datos['Marca temporal']):
+        return datos
+    return datos.sort_values('Marca temporal', kind='stable', na_position='last', ignore_index=True)
+
+
+def esta_ordenado(marca):
+    nulos = marca.isna().to_numpy()
+    n_validos = len(marca) - int(nulos.sum())
+    return not nulos[:n_validos].any() and marca.iloc[:n_validos].is_monotonic_increasing
+
+
+class IndiceFechas:
+    """Búsqueda de días en O(log n) sobre datos ya ordenados con `ordenar_por_marca`."""
+
+    def __init__(self, datos):
+        self.datos = datos
+        if 'Fecha_Filtro' in datos.columns:
+            self._dias = datos['Fecha_Filtro'].to_numpy(dtype='datetime64[D]')
+        else:
+            self._dias = np.array([], dtype='datetime64[D]')
+
+    @property
+    def nbytes(self):
+        return self._dias.nbytes
+
+    def posiciones(self, inicio, fin):
+        """Posiciones [i, j) de las filas entre `inicio` y `fin` (fechas, ambos incluidos)."""
+        i = np.searchsorted(self._dias, np.datetime64(inicio, 'D'), side='left')
+        j = np.searchsorted(self._dias, np.datetime64(fin, 'D'), side='right')
+        return int(i), int(max(i, j))
+
+    def rango(self, inicio, fin):
+        i, j = self.posiciones(inicio, fin)
+        return self.datos.iloc[i:j]
+
+    def dia(self, fecha):
+        return self.rango(fecha, fecha)
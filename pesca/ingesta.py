@@ -0,0 +1,94 @@
+"""Conversión de las filas crudas del formulario a un DataFrame tipado y compacto.
+
+Se ejecuta una sola vez por cada lote de filas que llega de la hoja (no en cada
+rerun de Streamlit). Las columnas de baja cardinalidad se guardan como
+`category`, `Bandejas` como float32 y el día como datetime64 a medianoche.
+
+Las celdas pueden llegar sin formato (números y seriales de fecha de Sheets, ver
+`SincronizadorHoja`) o como texto formateado; ambas formas se aceptan.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Subir cuando cambien los tipos/columnas producidos: invalida los snapshots guardados
+VERSION_ESQUEMA = 3
+
+# Formato con el que Google Forms escribe "Marca temporal" (configuración regional es-PE)
+FORMATO_MARCA_TEMPORAL = "%d/%m/%Y %H:%M:%S"
+
+COLUMNAS_REQUERIDAS = ['Calidad', 'Calibre', 'N° de Coche', 'Cuadrilla', 'Producto']
+COLUMNAS_CATEGORICAS = ['Cuadrilla', 'Producto', 'Calidad', 'Calibre', 'Lote']
+# Columnas de la hoja que usa el dashboard (el resto, p. ej. Observaciones, no se descarga)
+COLUMNAS_USADAS = ['Marca temporal', 'Cuadrilla', 'Producto', 'Calidad', 'Calibre', 'N° de Coche', 'Lote', 'Bandejas']
+
+# Día 0 de los seriales de fecha de Google Sheets (días desde esta fecha, con fracción)
+EPOCA_SHEETS = np.datetime64('1899-12-30', 's')
+
+
+def _desde_serial(serial):
+    # Redondeo al segundo: la fracción del día en el serial no es exacta
+    segundos = np.rint(np.asarray(serial, dtype='float64') * 86_400)
+    validos = np.isfinite(segundos)
+    marca = np.full(len(segundos), np.datetime64('NaT'), dtype='datetime64[s]')
+    marca[validos] = EPOCA_SHEETS + segundos[validos].astype('int64')
+    return marca.astype('datetime64[ns]')
+
+
+def _parsear_texto(texto):
+    marca = pd.to_datetime(texto, format=FORMATO_MARCA_TEMPORAL, errors='coerce')
+    # Sólo las filas que no siguen el formato esperado pasan por la inferencia (lenta)
+    pendientes = marca.isna() & texto.str.strip().ne('')
+    if pendientes.any():
+        marca[pendientes] = pd.to_datetime(texto[pendientes], format='mixed', dayfirst=True, errors='coerce')
+    return marca
+
+
+def _parsear_marca_temporal(valores):
+    if pd.api.types.is_numeric_dtype(valores):
+        return pd.Series(_desde_serial(valores), index=valores.index)
+    # Columna mixta: seriales (lectura sin formato) y texto (lecturas formateadas
+    # o fechas escritas a mano en la hoja)
+    es_serial = valores.map(type).isin((int, float)).to_numpy()
+    marca = pd.Series(np.full(len(valores), np.datetime64('NaT'), dtype='datetime64[ns]'), index=valores.index)
+    if es_serial.any():
+        marca[es_serial] = _desde_serial(valores[es_serial].to_numpy(dtype='float64'))
+    if not es_serial.all():
+        marca[~es_serial] = _parsear_texto(valores[~es_serial].astype(str))
+    return marca
+
+
+def procesar_registros(df):
+    """Tipa las filas crudas (todas texto) tal como llegan de la hoja."""
+    if df.empty: return df
+    df = df.copy()
+    df['Marca temporal'] = _parsear_marca_temporal(df['Marca temporal'])
+    df['Fecha_Filtro'] = df['Marca temporal'].dt.normalize()
+    df['Bandejas'] = pd.to_numeric(df['Bandejas'], errors='coerce').fillna(0).astype('float32')
+
+    for col in COLUMNAS_REQUERIDAS:
+        if col not in df.columns: df[col] = "S/D"
+
+    df['N° de Coche'] = df['N° de Coche'].astype(str).str.strip()
+    for col in COLUMNAS_CATEGORICAS:
+        df[col] = df[col].astype(str).str.strip().astype('category')
+    return df
+
+
+def concatenar_registros(previos, nuevos):
+    """Agrega filas procesadas sin perder el tipo `category` (pd.concat lo pasa a object
+    cuando las categorías difieren)."""
+    if previos is None or previos.empty: return nuevos
+    if nuevos.empty: return previos
+    nuevos = nuevos.copy()
+    previos_cat = {}
+    for col in COLUMNAS_CATEGORICAS:
+        if col in previos.columns and col in nuevos.columns:
+            # Categorías siempre ordenadas: los groupby devuelven grupos en orden alfabético
+            categorias = union_categoricals([previos[col], nuevos[col]], sort_categories=True).categories
+            if not categorias.equals(previos[col].cat.categories):
+                previos_cat[col] = previos[col].cat.set_categories(categorias)
+            nuevos[col] = nuevos[col].cat.set_categories(categorias)
+    if previos_cat:
+        previos = previos.assign(**previos_cat)
+    return pd.concat([previos, nuevos], ignore_index=True)
@@ -0,0 +1,112 @@
+"""Consulta paginada del historial completo para la pestaña Datos.
+
+El rango de fechas y los filtros (`FiltroHistorial`) definen qué registros se
+ven; el orden sólo decide qué filas entran en cada página. Por eso el resultado
+filtrado se guarda por filtro y cada orden se resuelve sobre él:
+
+- en memoria (`ResultadoEnMemoria`), con un `argsort` estable por columna que
+  sirve para ambos sentidos;
+- en SQLite (`pesca.fuentes.VistaSQLite`), con `ORDER BY … LIMIT/OFFSET`, sin
+  traer el historial filtrado.
+
+Al navegador sólo se envía la página visible.
+"""
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS_FILTRO = ['Cuadrilla', 'Producto', 'Lote']
+COLUMNAS_ORDEN = ['Marca temporal', 'Cuadrilla', 'Producto', 'Lote', 'Calidad', 'Calibre', 'N° de Coche', 'Bandejas']
+
+# Órdenes por columna que guarda cada resultado en memoria (un entero por registro cada uno)
+_ORDENES_GUARDADOS = 2
+
+
+@dataclass(frozen=True)
+class FiltroHistorial:
+    """Rango de fechas y filtros de la tabla. `filtros` es una tupla de (columna, valores);
+    una lista de valores vacía no filtra."""
+    desde: object = None
+    hasta: object = None
+    filtros: tuple = ()
+
+    def activos(self):
+        """{columna: valores} de los filtros que tienen algún valor."""
+        return {columna: list(valores) for columna, valores in self.filtros if valores}
+
+
+class ResultadoConsulta(ABC):
+    """Registros que cumplen un `FiltroHistorial`, paginables en cualquier orden."""
+
+    @property
+    @abstractmethod
+    def total(self):
+        """Número de registros filtrados."""
+
+    @abstractmethod
+    def pagina(self, numero, tamano, orden='Marca temporal', ascendente=False):
+        """Filas de la página `numero` (desde 1) ordenadas por la columna `orden`."""
+
+    @abstractmethod
+    def registros(self):
+        """Todos los registros filtrados, en orden de Marca temporal (para exportar)."""
+
+    def paginas(self, tamano):
+        return max(1, -(-self.total // tamano))
+
+
+class ResultadoEnMemoria(ResultadoConsulta):
+    def __init__(self, datos):
+        self._datos = datos
+        self._ordenes = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def total(self):
+        return len(self._datos)
+
+    def registros(self):
+        return self._datos
+
+    def _orden_ascendente(self, columna):
+        with self._lock:
+            if columna not in self._ordenes:
+                serie = self._datos[columna]
+                claves = serie.cat.codes.to_numpy() if isinstance(serie.dtype, pd.CategoricalDtype) else serie.to_numpy()
+                self._ordenes[columna] = np.argsort(claves, kind='stable')
+                while len(self._ordenes) > _ORDENES_GUARDADOS:
+                    self._ordenes.popitem(last=False)
+            self._ordenes.move_to_end(columna)
+            return self._ordenes[columna]
+
+    def pagina(self, numero, tamano, orden='Marca temporal', ascendente=False):
+        inicio = (numero - 1) * tamano
+        if orden == 'Marca temporal':
+            # Los registros ya vienen ordenados por Marca temporal
+            posiciones = np.arange(inicio, min(inicio + tamano, self.total))
+            if not ascendente:
+                posiciones = self.total - 1 - posiciones
+        else:
+            # El orden descendente es el ascendente recorrido al revés (una vista, sin copia)
+            posiciones = self._orden_ascendente(orden)
+            posiciones = (posiciones if ascendente else posiciones[::-1])[inicio:inicio + tamano]
+        return self._datos.iloc[posiciones]
+
+
+def filtrar_historial(vista, filtro):
+    """Registros de `vista` (una `pesca.fuentes.VistaDatos`) que cumplen `filtro`."""
+    filtros = filtro.activos()
+    cuadrillas = filtros.pop('Cuadrilla', None)
+    registros = vista.registros(filtro.desde, filtro.hasta, cuadrillas)
+
+    mascara = None
+    for columna, valores in filtros.items():
+        coincide = registros[columna].isin(valores).to_numpy()
+        mascara = coincide if mascara is None else mascara & coincide
+    if mascara is not None:
+        registros = registros[mascara]
+    return registros
@@ -0,0 +1,158 @@
+"""Rendimiento (envasado / descarga) por lote, por día y por período.
+
+Las toneladas descargadas no vienen del formulario: se ingresan a mano por
+(día, Lote) y se guardan en `AlmacenDescargas` (SQLite), así no se pierden al
+cambiar de día ni al reiniciar el servidor. `calcular_rendimiento` cruza esas
+descargas con el envasado por (día, Lote) del rollup en un único merge, para
+cualquier rango de fechas.
+
+Un lote sin descarga registrada no tiene rendimiento, y tampoco entra en el
+rendimiento del día ni en el del período: no se cuenta como 0 %.
+"""
+import sqlite3
+import threading
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from pesca.agregaciones import a_toneladas
+
+TABLA_DESCARGAS = "descargas"
+COLUMNAS_DESCARGA = ['Fecha_Filtro', 'Lote', 'Descarga (tn)']
+_FORMATO_DIA = "%Y-%m-%d"
+
+
+class AlmacenDescargas:
+    """Toneladas descargadas por (día, Lote), persistidas en una base SQLite local."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        with closing(sqlite3.connect(ruta)) as conexion:
+            conexion.execute(
+                f'CREATE TABLE IF NOT EXISTS {TABLA_DESCARGAS} ('
+                f'fecha TEXT NOT NULL, lote TEXT NOT NULL, toneladas REAL NOT NULL, actualizado TEXT NOT NULL, '
+                f'PRIMARY KEY (fecha, lote))'
+            )
+            conexion.commit()
+
+    def leer(self, desde=None, hasta=None):
+        """Descargas entre `desde` y `hasta` (inclusive) con las columnas `COLUMNAS_DESCARGA`."""
+        condiciones, parametros = [], []
+        if desde is not None:
+            condiciones.append("fecha >= ?")
+            parametros.append(pd.Timestamp(desde).strftime(_FORMATO_DIA))
+        if hasta is not None:
+            condiciones.append("fecha <= ?")
+            parametros.append(pd.Timestamp(hasta).strftime(_FORMATO_DIA))
+        donde = (" WHERE " + " AND ".join(condiciones)) if condiciones else ""
+        # Una conexión por consulta: sqlite3 no comparte conexiones entre hilos
+        with closing(sqlite3.connect(self.ruta)) as conexion:
+            tabla = pd.read_sql_query(
+                f"SELECT fecha, lote, toneladas FROM {TABLA_DESCARGAS}{donde} ORDER BY fecha, lote", conexion, params=parametros
+            )
+        tabla.columns = COLUMNAS_DESCARGA
+        tabla['Fecha_Filtro'] = pd.to_datetime(tabla['Fecha_Filtro'], format=_FORMATO_DIA)
+        return tabla
+
+    def del_dia(self, fecha):
+        """{Lote: toneladas} registradas para un día."""
+        tabla = self.leer(fecha, fecha)
+        return dict(zip(tabla['Lote'], tabla['Descarga (tn)']))
+
+    def guardar(self, fecha, descargas):
+        """Reemplaza las descargas de los lotes dados para `fecha`.
+
+        `descargas` es un {Lote: toneladas}; un valor vacío o <= 0 borra el registro.
+        """
+        dia = pd.Timestamp(fecha).strftime(_FORMATO_DIA)
+        ahora = datetime.now(timezone.utc).isoformat()
+        filas, borrar = [], []
+        for lote, toneladas in descargas.items():
+            if pd.notna(toneladas) and toneladas > 0:
+                filas.append((dia, str(lote), float(toneladas), ahora))
+            else:
+                borrar.append((dia, str(lote)))
+        with self._lock, closing(sqlite3.connect(self.ruta)) as conexion:
+            conexion.executemany(
+                f"INSERT INTO {TABLA_DESCARGAS} (fecha, lote, toneladas, actualizado) VALUES (?, ?, ?, ?) "
+                f"ON CONFLICT (fecha, lote) DO UPDATE SET toneladas = excluded.toneladas, actualizado = excluded.actualizado",
+                filas,
+            )
+            conexion.executemany(f"DELETE FROM {TABLA_DESCARGAS} WHERE fecha = ? AND lote = ?", borrar)
+            conexion.commit()
+
+
+def envasado_por_lote(rollup):
+    """Bandejas por (día, Lote) a partir del rollup (todas las cuadrillas y productos)."""
+    if rollup.empty:
+        return pd.DataFrame({'Fecha_Filtro': pd.Series(dtype='datetime64[ns]'), 'Lote': pd.Series(dtype=object), 'Bandejas': pd.Series(dtype='float64')})
+    tabla = rollup.groupby(['Fecha_Filtro', 'Lote'], observed=True)['Bandejas'].sum().reset_index()
+    tabla['Fecha_Filtro'] = pd.to_datetime(tabla['Fecha_Filtro'])
+    tabla['Lote'] = tabla['Lote'].astype(str)
+    return tabla
+
+
+def _porcentaje(envasado, descarga):
+    envasado, descarga = np.asarray(envasado, dtype='float64'), np.asarray(descarga, dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(descarga > 0, envasado / descarga * 100, np.nan)
+
+
+@dataclass(frozen=True)
+class Rendimiento:
+    """Rendimiento de un rango de fechas.
+
+    `por_lote` tiene una fila por (día, Lote) con envasado o descarga; `por_dia` y
+    `por_lote_periodo` resumen esa tabla. El rendimiento sólo usa los lotes con descarga.
+    """
+    por_lote: pd.DataFrame
+    por_dia: pd.DataFrame
+    por_lote_periodo: pd.DataFrame
+    descarga: float
+    envasado: float
+    envasado_con_descarga: float
+    lotes_sin_descarga: int
+
+    @property
+    def porcentaje(self):
+        return float(_porcentaje(self.envasado_con_descarga, self.descarga))
+
+
+def _resumir(tabla, claves):
+    resumen = tabla.groupby(claves, sort=True).agg(
+        **{
+            'Descarga (tn)': ('Descarga (tn)', 'sum'),
+            'Envasado (tn)': ('Envasado (tn)', 'sum'),
+            '_envasado_con_descarga': ('_envasado_con_descarga', 'sum'),
+            'Lotes sin descarga': ('_sin_descarga', 'sum'),
+        }
+    ).reset_index()
+    resumen['Rendimiento (%)'] = _porcentaje(resumen['_envasado_con_descarga'], resumen['Descarga (tn)'])
+    return resumen.drop(columns='_envasado_con_descarga')
+
+
+def calcular_rendimiento(envasado, descargas, kilos_por_bandeja):
+    """Cruza el envasado por (día, Lote) (ver `envasado_por_lote`) con las descargas registradas."""
+    tabla = envasado.merge(descargas, on=['Fecha_Filtro', 'Lote'], how='outer')
+    tabla['Envasado (tn)'] = a_toneladas(tabla['Bandejas'].fillna(0.0), kilos_por_bandeja)
+    con_descarga = (tabla['Descarga (tn)'] > 0).to_numpy()
+    tabla['_envasado_con_descarga'] = np.where(con_descarga, tabla['Envasado (tn)'], 0.0)
+    tabla['_sin_descarga'] = ~con_descarga
+    tabla = tabla.sort_values(['Fecha_Filtro', 'Lote'], ignore_index=True)
+
+    por_lote = tabla[['Fecha_Filtro', 'Lote', 'Descarga (tn)', 'Envasado (tn)']].copy()
+    por_lote['Rendimiento (%)'] = _porcentaje(tabla['Envasado (tn)'], tabla['Descarga (tn)'])
+    por_lote_periodo = _resumir(tabla, 'Lote').drop(columns='Lotes sin descarga')
+    return Rendimiento(
+        por_lote=por_lote,
+        por_dia=_resumir(tabla, 'Fecha_Filtro'),
+        por_lote_periodo=por_lote_periodo,
+        descarga=float(tabla['Descarga (tn)'].sum()),
+        envasado=float(tabla['Envasado (tn)'].sum()),
+        envasado_con_descarga=float(tabla['_envasado_con_descarga'].sum()),
+        lotes_sin_descarga=int(tabla['_sin_descarga'].sum()),
+    )
@@ -0,0 +1,206 @@
+"""Generación de reportes diarios por lotes, sin Streamlit.
+
+Reutiliza el mismo `ReporteDiario` que la pestaña Reporte para escribir un
+archivo por día (Excel, HTML y/o JSON). El snapshot Parquet se carga una sola
+vez, antes de repartir los días entre procesos: con `fork` todos comparten esa
+copia (con `spawn` cada proceso lo carga al iniciar). Un día que falla se
+informa y no detiene el resto.
+
+Uso:
+    python -m pesca.reportes --desde 2026-09-01 --hasta 2026-10-15 --formato xlsx html json
+    python -m pesca.reportes --fecha 2026-10-15 --sincronizar
+"""
+import argparse
+import html
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from functools import partial
+
+import pandas as pd
+
+from pesca.agregaciones import ReporteDiario
+from pesca.indice import IndiceFechas, ordenar_por_marca
+from pesca.snapshot import cargar_snapshot
+
+FORMATOS_REPORTE = ("xlsx", "html", "json")
+
+# Excel limita los nombres de hoja a 31 caracteres y no admite estos
+_LARGO_HOJA = 31
+_CARACTERES_HOJA = re.compile(r"[\[\]:*?/\\]")
+
+# Índice de los registros: se carga en el proceso principal y los procesos
+# creados con `fork` lo heredan; con `spawn` lo carga el inicializador
+_indice = None
+
+
+def _cargar_indice(ruta_snapshot):
+    snapshot = cargar_snapshot(ruta_snapshot)
+    if snapshot is None:
+        raise RuntimeError(f"No se pudo leer el snapshot: {ruta_snapshot}")
+    return IndiceFechas(ordenar_por_marca(snapshot[0]))
+
+
+def _inicializar_proceso(ruta_snapshot):
+    global _indice
+    if _indice is None:
+        _indice = _cargar_indice(ruta_snapshot)
+
+
+def tablas_reporte(reporte, kilos_por_bandeja):
+    """Las tablas del Reporte de un día, en el orden en que se muestran en el dashboard."""
+    tablas = {
+        "Resumen": pd.DataFrame([reporte.kpis(kilos_por_bandeja)]),
+        "Por Lote": reporte.resumen_por('Lote', kilos_por_bandeja),
+        "Por Cuadrilla": reporte.resumen_por('Cuadrilla', kilos_por_bandeja),
+    }
+    for lote in reporte.lotes:
+        tablas[f"Lote {lote}"] = reporte.detalle_lote(lote, kilos_por_bandeja)
+    return tablas
+
+
+def _nombres_hoja(nombres):
+    """Nombres de hoja válidos y distintos (los lotes son texto libre)."""
+    usados, resultado = set(), []
+    for nombre in nombres:
+        base = _CARACTERES_HOJA.sub("_", nombre).strip("'")[:_LARGO_HOJA] or "Hoja"
+        candidato, n = base, 1
+        # Excel no distingue mayúsculas en los nombres de hoja
+        while candidato.lower() in usados:
+            n += 1
+            sufijo = f" ({n})"
+            candidato = base[:_LARGO_HOJA - len(sufijo)] + sufijo
+        usados.add(candidato.lower())
+        resultado.append(candidato)
+    return resultado
+
+
+def _escribir_xlsx(ruta, tablas):
+    with pd.ExcelWriter(ruta, engine='xlsxwriter') as writer:
+        for hoja, tabla in zip(_nombres_hoja(tablas), tablas.values()):
+            tabla.to_excel(writer, index=False, sheet_name=hoja)
+
+
+def _escribir_html(ruta, fecha, tablas):
+    partes = [f"<h1>Reporte de producción {fecha:%d/%m/%Y}</h1>"]
+    for nombre, tabla in tablas.items():
+        partes.append(f"<h2>{html.escape(nombre)}</h2>")
+        partes.append(tabla.to_html(index=False, float_format=lambda x: f"{x:,.2f}", border=0))
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html><html><head><meta charset='utf-8'></head><body>")
+        f.write("\n".join(partes))
+        f.write("</body></html>")
+
+
+def _escribir_json(ruta, fecha, tablas):
+    contenido = {"fecha": fecha.isoformat()}
+    contenido.update({nombre: json.loads(tabla.to_json(orient="records", force_ascii=False))
+                      for nombre, tabla in tablas.items()})
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(contenido, f, ensure_ascii=False, indent=2)
+
+
+def generar_reporte_dia(fecha, formatos, carpeta, kilos_por_bandeja, indice=None):
+    """Escribe los archivos del día. Devuelve un resumen, o None si el día no tiene datos."""
+    indice = indice if indice is not None else _indice
+    reporte = ReporteDiario.desde_registros(indice.dia(fecha))
+    if reporte.vacio:
+        return None
+
+    tablas = tablas_reporte(reporte, kilos_por_bandeja)
+    archivos = []
+    for formato in formatos:
+        ruta = os.path.join(carpeta, f"reporte_{fecha.isoformat()}.{formato}")
+        if formato == "xlsx":
+            _escribir_xlsx(ruta, tablas)
+        elif formato == "html":
+            _escribir_html(ruta, fecha, tablas)
+        else:
+            _escribir_json(ruta, fecha, tablas)
+        archivos.append(ruta)
+    return {"fecha": fecha.isoformat(), **reporte.kpis(kilos_por_bandeja), "archivos": archivos}
+
+
+def _generar_o_informar(fecha, **opciones):
+    """Como `generar_reporte_dia`, pero un error queda en el resumen del día en lugar de propagarse."""
+    try:
+        return generar_reporte_dia(fecha, **opciones)
+    except Exception as e:
+        return {"fecha": fecha.isoformat(), "error": f"{type(e).__name__}: {e}"}
+
+
+def generar_reportes(ruta_snapshot, fechas, formatos, carpeta, kilos_por_bandeja=10.0, procesos=None):
+    """Resúmenes de los días con datos; los días que fallan traen la clave "error"."""
+    global _indice
+    os.makedirs(carpeta, exist_ok=True)
+    if not fechas:
+        return []
+    tarea = partial(_generar_o_informar, formatos=formatos, carpeta=carpeta, kilos_por_bandeja=kilos_por_bandeja)
+    # Una sola carga del snapshot, antes de crear los procesos
+    _indice = _cargar_indice(ruta_snapshot)
+    trabajadores = min(procesos or os.cpu_count() or 1, len(fechas))
+    if trabajadores == 1:
+        return [r for r in map(tarea, fechas) if r is not None]
+
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=_inicializar_proceso, initargs=(ruta_snapshot,)) as pool:
+        resultados = pool.map(tarea, fechas, chunksize=max(1, len(fechas) // (4 * trabajadores)))
+        return [r for r in resultados if r is not None]
+
+
+def _sincronizar_snapshot(ruta_snapshot, credenciales, libro, hoja):
+    """Trae las filas nuevas de Sheets al snapshot antes de generar los reportes."""
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    from pesca.actualizacion import ActualizadorDatos
+    from pesca.ingesta import COLUMNAS_USADAS, procesar_registros
+    from pesca.sincronizacion import SincronizadorHoja
+
+    scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+    client = gspread.authorize(Credentials.from_service_account_file(credenciales, scopes=scopes))
+    sheet = client.open(libro).worksheet(hoja)
+    ActualizadorDatos(SincronizadorHoja(sheet, COLUMNAS_USADAS), procesar_registros, ruta_snapshot).actualizar()
+
+
+def _fechas(desde, hasta):
+    return [desde + timedelta(days=i) for i in range((hasta - desde).days + 1)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pesca.reportes", description="Genera reportes diarios de producción.")
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--fecha", type=date.fromisoformat, help="Un solo día (AAAA-MM-DD)")
+    grupo.add_argument("--desde", type=date.fromisoformat, help="Primer día del rango (AAAA-MM-DD)")
+    parser.add_argument("--hasta", type=date.fromisoformat, help="Último día del rango (por defecto, igual a --desde)")
+    parser.add_argument("--formato", nargs="+", choices=FORMATOS_REPORTE, default=["xlsx"])
+    parser.add_argument("--salida", default="reportes", help="Carpeta de salida")
+    parser.add_argument("--kilos-por-bandeja", type=float, default=10.0)
+    parser.add_argument("--snapshot", default=os.environ.get("PESCA_SNAPSHOT", "datos_pesca.parquet"))
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos en paralelo (por defecto, uno por CPU)")
+    parser.add_argument("--sincronizar", action="store_true", help="Actualizar el snapshot desde Google Sheets antes")
+    parser.add_argument("--credenciales", default="credenciales.json")
+    # Mismas variables que el dashboard (ver `interfaz.config`): se sincroniza la misma hoja
+    parser.add_argument("--libro", default=os.environ.get("PESCA_LIBRO", "Base de datos"), help="Libro de Google Sheets")
+    parser.add_argument("--hoja", default=os.environ.get("PESCA_HOJA", "Respuestas de formulario 2"), help="Hoja del libro")
+    args = parser.parse_args(argv)
+
+    if args.sincronizar:
+        _sincronizar_snapshot(args.snapshot, args.credenciales, args.libro, args.hoja)
+
+    fechas = [args.fecha] if args.fecha else _fechas(args.desde, args.hasta or args.desde)
+    resumen = generar_reportes(args.snapshot, fechas, args.formato, args.salida, args.kilos_por_bandeja, args.procesos)
+    errores = [dia for dia in resumen if "error" in dia]
+    for dia in resumen:
+        if "error" in dia:
+            print(f"{dia['fecha']}: ERROR {dia['error']}", file=sys.stderr)
+        else:
+            print(f"{dia['fecha']}: {dia['Bandejas']:,.0f} bandejas, {dia['Toneladas']:,.2f} t -> {', '.join(dia['archivos'])}")
+    print(f"{len(resumen) - len(errores)} reportes generados de {len(fechas)} días solicitados.")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Ritmo de trabajo de las cuadrillas a lo largo del turno (bandejas por hora).
+
+Todo se calcula con NumPy sobre los registros del día ordenados por
+(Cuadrilla, Marca temporal), sin recorrer filas en Python:
+- el ritmo móvil de cada registro es la suma de bandejas de su cuadrilla en la
+  ventana (t - ventana, t], obtenida con sumas acumuladas y `searchsorted`;
+- una pausa es un intervalo entre registros consecutivos de una cuadrilla más
+  largo que `UMBRAL_PAUSA_MINUTOS`.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+VENTANAS_MINUTOS = (30, 60)
+UMBRAL_PAUSA_MINUTOS = 20
+
+_NS_POR_MINUTO = 60 * 10**9
+
+
+def _columna_ritmo(minutos):
+    return f"Ritmo {minutos} min (b/h)"
+
+
+@dataclass(frozen=True)
+class RitmoCuadrillas:
+    """Ritmo del día.
+
+    - `resumen`: una fila por Cuadrilla (totales, bandejas/hora, picos y pausas);
+    - `curvas`: una fila por registro con el ritmo móvil de cada ventana;
+    - `pausas`: una fila por pausa (Cuadrilla, Desde, Hasta, Minutos).
+    """
+    resumen: pd.DataFrame
+    curvas: pd.DataFrame
+    pausas: pd.DataFrame
+
+    @property
+    def vacio(self):
+        return self.curvas.empty
+
+
+def _suma_en_ventana(clave, acumulado, ventana):
+    """Suma de cada posición y las anteriores con `clave` en (clave - ventana, clave]."""
+    inicio = np.searchsorted(clave, clave - ventana, side='right')
+    previo = np.concatenate(([0.0], acumulado))[inicio]
+    return acumulado - previo
+
+
+def calcular_ritmo(registros, umbral_pausa_minutos=UMBRAL_PAUSA_MINUTOS, ventanas=VENTANAS_MINUTOS):
+    """Ritmo por Cuadrilla de los registros de un día (ver `RitmoCuadrillas`)."""
+    marca = registros['Marca temporal'].to_numpy(dtype='datetime64[ns]')
+    validos = ~np.isnat(marca) & registros['Cuadrilla'].notna().to_numpy()
+    if not validos.any():
+        return RitmoCuadrillas(_resumen_vacio(ventanas), pd.DataFrame(), pd.DataFrame(columns=['Cuadrilla', 'Desde', 'Hasta', 'Minutos']))
+
+    codigos, cuadrillas = pd.factorize(registros['Cuadrilla'].to_numpy()[validos], sort=True)
+    marca = marca[validos]
+    bandejas = np.nan_to_num(registros['Bandejas'].to_numpy(dtype='float64')[validos])
+
+    # Orden (Cuadrilla, Marca temporal): cada cuadrilla queda en un bloque contiguo
+    orden = np.lexsort((marca, codigos))
+    codigos, marca, bandejas = codigos[orden], marca[orden], bandejas[orden]
+    n_cuadrillas = len(cuadrillas)
+
+    # Clave única ordenada: separación entre cuadrillas mayor que cualquier ventana
+    tiempo = (marca - marca.min()).astype(np.int64)
+    separacion = tiempo.max() + max(ventanas) * _NS_POR_MINUTO + 1
+    clave = codigos.astype(np.int64) * separacion + tiempo
+    acumulado = np.cumsum(bandejas)
+
+    curvas = pd.DataFrame({
+        'Marca temporal': marca,
+        'Cuadrilla': pd.Categorical.from_codes(codigos, cuadrillas),
+        'Bandejas': bandejas,
+    })
+    for minutos in ventanas:
+        curvas[_columna_ritmo(minutos)] = _suma_en_ventana(clave, acumulado, minutos * _NS_POR_MINUTO) * 60 / minutos
+
+    # Límites de cada bloque de cuadrilla
+    primeros = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]])
+    ultimos = np.r_[primeros[1:], len(codigos)] - 1
+    inicio, fin = marca[primeros], marca[ultimos]
+    horas = (fin - inicio) / np.timedelta64(1, 'h')
+
+    # Pausas: saltos entre registros consecutivos de la misma cuadrilla
+    salto = np.diff(marca) / np.timedelta64(1, 'm')
+    es_pausa = (codigos[1:] == codigos[:-1]) & (salto > umbral_pausa_minutos)
+    posiciones = np.flatnonzero(es_pausa)
+    pausas = pd.DataFrame({
+        'Cuadrilla': pd.Categorical.from_codes(codigos[posiciones], cuadrillas),
+        'Desde': marca[posiciones],
+        'Hasta': marca[posiciones + 1],
+        'Minutos': salto[posiciones],
+    })
+    codigos_pausa = codigos[posiciones]
+    minutos_pausa = np.bincount(codigos_pausa, weights=salto[posiciones], minlength=n_cuadrillas)
+    pausa_maxima = np.zeros(n_cuadrillas)
+    np.maximum.at(pausa_maxima, codigos_pausa, salto[posiciones])
+
+    totales = np.bincount(codigos, weights=bandejas, minlength=n_cuadrillas)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        activas = horas - minutos_pausa / 60
+        resumen = pd.DataFrame({
+            'Cuadrilla': cuadrillas.astype(str),
+            'Registros': np.bincount(codigos, minlength=n_cuadrillas),
+            'Bandejas': totales,
+            'Inicio': inicio,
+            'Fin': fin,
+            'Horas': horas,
+            'Bandejas/hora': np.where(horas > 0, totales / horas, np.nan),
+            'Bandejas/hora activa': np.where(activas > 0, totales / activas, np.nan),
+        })
+    for minutos in ventanas:
+        pico = np.zeros(n_cuadrillas)
+        np.maximum.at(pico, codigos, curvas[_columna_ritmo(minutos)].to_numpy())
+        resumen[f"Pico {minutos} min (b/h)"] = pico
+    resumen['Pausas'] = np.bincount(codigos_pausa, minlength=n_cuadrillas)
+    resumen['Minutos en pausa'] = minutos_pausa
+    resumen['Pausa más larga (min)'] = pausa_maxima
+    return RitmoCuadrillas(resumen, curvas, pausas)
+
+
+def _resumen_vacio(ventanas):
+    columnas = ['Cuadrilla', 'Registros', 'Bandejas', 'Inicio', 'Fin', 'Horas', 'Bandejas/hora', 'Bandejas/hora activa']
+    columnas += [f"Pico {minutos} min (b/h)" for minutos in ventanas]
+    return pd.DataFrame(columns=columnas + ['Pausas', 'Minutos en pausa', 'Pausa más larga (min)'])
@@ -0,0 +1,63 @@
+"""Resumen diario materializado (día × Cuadrilla × Producto × Lote).
+
+Se mantiene de forma incremental: cuando llegan filas nuevas sólo se recalculan
+los días que esas filas tocan. El Histórico agrega sobre esta tabla (unas pocas
+filas por día) en lugar de recorrer todos los registros, y compara períodos con
+sus sumas acumuladas (ver `pesca.acumulados`).
+"""
+import pandas as pd
+
+from pesca.acumulados import AcumuladosDiarios
+from pesca.indice import IndiceFechas
+from pesca.ingesta import concatenar_registros
+
+CLAVES_ROLLUP = ['Fecha_Filtro', 'Cuadrilla', 'Producto', 'Lote']
+
+
+def calcular_rollup(registros):
+    if registros.empty or 'Fecha_Filtro' not in registros.columns:
+        return pd.DataFrame(columns=CLAVES_ROLLUP + ['Bandejas', 'Registros', 'Primera', 'Ultima'])
+    return registros.groupby(CLAVES_ROLLUP, observed=True).agg(
+        Bandejas=('Bandejas', 'sum'),
+        Registros=('Bandejas', 'size'),
+        Primera=('Marca temporal', 'min'),
+        Ultima=('Marca temporal', 'max'),
+    ).reset_index()
+
+
+class RollupDiario:
+    """Tabla de resumen ordenada por día, con su propio índice de fechas y sus sumas acumuladas."""
+
+    def __init__(self, tabla):
+        self.tabla = tabla
+        self.indice = IndiceFechas(tabla)
+        self.acumulados = AcumuladosDiarios.desde_rollup(tabla)
+
+    @classmethod
+    def desde_registros(cls, registros):
+        return cls(calcular_rollup(registros))
+
+    def actualizar(self, indice_registros, nuevas):
+        """Devuelve un rollup nuevo recalculando sólo los días presentes en `nuevas`.
+
+        `indice_registros` es el índice de los registros completos (ya incluyendo `nuevas`).
+        """
+        dias = nuevas['Fecha_Filtro'].dropna()
+        if dias.empty:
+            return self
+        inicio, fin = dias.min(), dias.max()
+        # Los registros están ordenados: los días tocados forman un bloque contiguo
+        recalculado = calcular_rollup(indice_registros.rango(inicio, fin))
+        i, j = self.indice.posiciones(inicio, fin)
+        tabla = concatenar_registros(self.tabla.iloc[:i], recalculado)
+        tabla = concatenar_registros(tabla, self.tabla.iloc[j:])
+        return RollupDiario(tabla)
+
+    def rango(self, inicio, fin, cuadrillas=None):
+        tabla = self.indice.rango(inicio, fin)
+        if cuadrillas is not None:
+            tabla = tabla[tabla['Cuadrilla'].isin(cuadrillas)]
+        return tabla
+
+    def cuadrillas(self):
+        return sorted(self.tabla['Cuadrilla'].unique())
@@ -0,0 +1,161 @@
+"""Sincronización incremental de la hoja "Respuestas de formulario 2".
+
+La hoja de respuestas del formulario sólo crece por el final, así que basta con
+recordar cuántas filas ya se ingirieron y pedir a Google Sheets únicamente el
+rango nuevo. Si el encabezado cambia o la hoja se achica, se relee completa.
+
+Sólo se piden las columnas que se usan (un rango por cada bloque de columnas
+contiguas), por columnas y sin formato: los números llegan como números y las
+fechas como seriales de Sheets, que `procesar_registros` convierte sin parsear
+texto.
+"""
+import threading
+from dataclasses import dataclass
+
+import pandas as pd
+from gspread.utils import DateTimeOption, Dimension, ValueRenderOption, rowcol_to_a1
+
+# Valores crudos y una lista por columna (en lugar de una por fila)
+_OPCIONES_LECTURA = dict(
+    major_dimension=Dimension.cols,
+    value_render_option=ValueRenderOption.unformatted,
+    date_time_render_option=DateTimeOption.serial_number,
+)
+
+
+def _letra_columna(numero):
+    return rowcol_to_a1(1, numero).rstrip("0123456789")
+
+
+def _bloques_contiguos(posiciones):
+    """Agrupa posiciones de columna (1-based, ordenadas) en bloques [primera, última]."""
+    bloques = []
+    for posicion in posiciones:
+        if bloques and bloques[-1][1] == posicion - 1:
+            bloques[-1][1] = posicion
+        else:
+            bloques.append([posicion, posicion])
+    return bloques
+
+
+def _encabezado(respuesta):
+    # Cada columna llega como [valor] o [] si la celda está vacía
+    encabezado = [str(c[0]) if c else "" for c in respuesta]
+    while encabezado and encabezado[-1] == "":
+        encabezado.pop()
+    return encabezado
+
+
+def _unir_columnas(respuestas, bloques):
+    """Columnas de todos los rangos, igualadas en largo: la API omite las celdas
+    vacías al final de cada columna y las columnas vacías al final del rango."""
+    columnas = []
+    for respuesta, (primera, ultima) in zip(respuestas, bloques):
+        ancho = ultima - primera + 1
+        leidas = [list(c) for c in list(respuesta)[:ancho]]
+        columnas.extend(leidas + [[] for _ in range(ancho - len(leidas))])
+    largo = max((len(c) for c in columnas), default=0)
+    for columna in columnas:
+        columna.extend([""] * (largo - len(columna)))
+    return columnas, largo
+
+
+@dataclass
+class Cambios:
+    """Filas crudas leídas en una sincronización.
+
+    Si `reinicio` es True, `filas` es la hoja completa y reemplaza a lo anterior;
+    si no, son sólo las filas nuevas que hay que agregar al final.
+    """
+    filas: pd.DataFrame
+    reinicio: bool
+
+
+class SincronizadorHoja:
+    """Recuerda hasta dónde se leyó la hoja y en cada llamada trae sólo la cola.
+
+    `columnas` limita la lectura a esas columnas (por nombre de encabezado);
+    con None se leen todas.
+    """
+
+    def __init__(self, worksheet, columnas=None):
+        self.worksheet = worksheet
+        self.columnas = list(columnas) if columnas is not None else None
+        self.encabezados = []
+        self.filas_ingeridas = 0
+        self._ultima_fila = None
+        self._lock = threading.Lock()
+
+    def estado(self):
+        """Posición de lectura serializable (para retomar tras un reinicio del servidor)."""
+        return {
+            "encabezados": self.encabezados,
+            "filas_ingeridas": self.filas_ingeridas,
+            "ultima_fila": self._ultima_fila,
+        }
+
+    def restaurar(self, estado):
+        with self._lock:
+            self.encabezados = list(estado["encabezados"])
+            self.filas_ingeridas = int(estado["filas_ingeridas"])
+            self._ultima_fila = estado["ultima_fila"]
+
+    def sincronizar(self):
+        """Lee la hoja desde la última posición conocida y devuelve los `Cambios`."""
+        with self._lock:
+            cambios = self._sincronizar_cola() if self.encabezados else None
+            if cambios is None:
+                cambios = self._resincronizar()
+            return cambios
+
+    def _seleccion(self):
+        """(nombres, bloques de columnas) a leer según el encabezado actual."""
+        posiciones = [
+            i for i, nombre in enumerate(self.encabezados, start=1)
+            if self.columnas is None or nombre in self.columnas
+        ]
+        return [self.encabezados[i - 1] for i in posiciones], _bloques_contiguos(posiciones)
+
+    def _leer(self, fila_inicio, con_encabezado):
+        nombres, bloques = self._seleccion()
+        rangos = [f"{_letra_columna(a)}{fila_inicio}:{_letra_columna(b)}" for a, b in bloques]
+        respuestas = self.worksheet.batch_get((["1:1"] if con_encabezado else []) + rangos, **_OPCIONES_LECTURA)
+        encabezado = _encabezado(respuestas[0]) if con_encabezado else None
+        columnas, largo = _unir_columnas(respuestas[1:] if con_encabezado else respuestas, bloques)
+        return encabezado, nombres, columnas, largo
+
+    def _resincronizar(self):
+        self.encabezados = _encabezado(self.worksheet.batch_get(["1:1"], **_OPCIONES_LECTURA)[0])
+        if not self.encabezados:
+            self.filas_ingeridas, self._ultima_fila = 0, None
+            return Cambios(pd.DataFrame(), reinicio=True)
+        _, nombres, columnas, largo = self._leer(2, con_encabezado=False)
+        self.filas_ingeridas = largo
+        self._ultima_fila = [c[-1] for c in columnas] if largo else None
+        return Cambios(_a_frame(nombres, columnas), reinicio=True)
+
+    def _sincronizar_cola(self):
+        """Lee encabezado + cola en una sola llamada. Devuelve None si hay que resincronizar."""
+        # Se relee la última fila ya ingerida para comprobar que la hoja no se achicó
+        inicio = self.filas_ingeridas + 1 if self.filas_ingeridas else 2
+        encabezado, nombres, columnas, largo = self._leer(inicio, con_encabezado=True)
+
+        if encabezado != self.encabezados:
+            return None
+
+        if self.filas_ingeridas:
+            if not largo or [c[0] for c in columnas] != self._ultima_fila:
+                return None
+            columnas = [c[1:] for c in columnas]
+            largo -= 1
+
+        if largo:
+            self.filas_ingeridas += largo
+            self._ultima_fila = [c[-1] for c in columnas]
+        return Cambios(_a_frame(nombres, columnas), reinicio=False)
+
+
+def _a_frame(nombres, columnas):
+    datos = pd.DataFrame(dict(enumerate(columnas)), columns=range(len(columnas)))
+    datos.columns = nombres
+    return datos
@@ -0,0 +1,53 @@
+"""Copia local en Parquet de los datos ya procesados.
+
+Tras reiniciar el servidor, los datos se leen de este archivo (lectura columnar
+con memory-map) y la sincronización con Sheets sólo trae lo que falta. La
+posición de lectura de la hoja se guarda en los metadatos del propio archivo.
+"""
+import json
+import logging
+import os
+
+from pesca.ingesta import VERSION_ESQUEMA
+
+logger = logging.getLogger(__name__)
+
+_CLAVE_ESTADO = b"pesca.sincronizacion"
+_CLAVE_ESQUEMA = b"pesca.esquema"
+# Row groups pequeños: como el archivo está ordenado por fecha, `FuenteParquet`
+# puede saltar los grupos fuera del rango pedido usando sus estadísticas
+FILAS_POR_GRUPO = 50_000
+
+
+def guardar_snapshot(ruta, datos, estado):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tabla = pa.Table.from_pandas(datos, preserve_index=False)
+    metadatos = dict(tabla.schema.metadata or {})
+    metadatos[_CLAVE_ESTADO] = json.dumps(estado).encode("utf-8")
+    metadatos[_CLAVE_ESQUEMA] = str(VERSION_ESQUEMA).encode("utf-8")
+    tabla = tabla.replace_schema_metadata(metadatos)
+    # Escritura atómica: nunca queda un archivo a medio escribir
+    temporal = f"{ruta}.tmp"
+    pq.write_table(tabla, temporal, row_group_size=FILAS_POR_GRUPO)
+    os.replace(temporal, ruta)
+
+
+def cargar_snapshot(ruta):
+    """Devuelve (datos, estado) o None si no hay snapshot utilizable."""
+    if not os.path.exists(ruta):
+        return None
+    import pyarrow.parquet as pq
+
+    try:
+        metadatos = pq.read_schema(ruta).metadata or {}
+        if metadatos.get(_CLAVE_ESQUEMA) != str(VERSION_ESQUEMA).encode("utf-8"):
+            logger.info("Snapshot con esquema antiguo, se descarta: %s", ruta)
+            return None
+        tabla = pq.read_table(ruta, memory_map=True)
+        estado = json.loads(tabla.schema.metadata[_CLAVE_ESTADO])
+        return tabla.to_pandas(), estado
+    except Exception:
+        logger.exception("Snapshot ilegible, se descarta: %s", ruta)
+        return None